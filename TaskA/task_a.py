@@ -24,7 +24,7 @@ Phone: 0401234567
 Email: anna.virtanen@example.com
 """
 
-from datetime import datetime, time
+from tasks.schema import get_converter
 
 
 def main():
@@ -35,35 +35,28 @@ def main():
     with open(reservations, "r", encoding="utf-8") as f:
         reservation = f.read().strip()
 
-    reservation = reservation.split('|')
-    reservationNum = int(reservation[0])
-    booker = reservation[1]
+    # Convert the fields with the shared booking format
+    reservation = get_converter("booking", "dict")(reservation.split('|'))
 
-    day = datetime.strptime(reservation[2], "%Y-%m-%d").date()
-    finnish_day = day.strftime("%d.%m.%Y")
+    finnish_day = reservation["reservationDate"].strftime("%d.%m.%Y")
+    finnish_time = reservation["reservationTime"].strftime("%H.%M")
 
-    time = datetime.strptime(reservation[3], "%H:%M").time()
-    finnish_time = time.strftime("%H.%M")
-
-    hours = int(reservation[4])
-    hourlyPrice = float(reservation[5])
+    hours = reservation["durationHours"]
+    hourlyPrice = reservation["price"]
     totalPrice = hourlyPrice * hours
-    paid = bool(reservation[6])
-    location = reservation[7]
-    phone = reservation[8]
-    email = reservation[9]
+    paid = reservation["paid"]
 
-    print(f"Reservation number: {reservationNum}")
-    print(f"Booker: {booker}")
+    print(f"Reservation number: {reservation['reservationId']}")
+    print(f"Booker: {reservation['name']}")
     print(f"Date: {finnish_day}")
     print(f"Start time: {finnish_time}")
     print(f"Number of hours: {hours}")
     print(f"Hourly price: {hourlyPrice:.2f}".replace(".", ",") + " €")
     print(f"Total price: {totalPrice:.2f}".replace(".", ",") + " €")
     print(f"Paid: {'Yes' if paid else 'No'}")
-    print(f"Location: {location}")
-    print(f"Phone: {phone}")
-    print(f"Email: {email}")
+    print(f"Location: {reservation['reservedResource']}")
+    print(f"Phone: {reservation['phone']}")
+    print(f"Email: {reservation['email']}")
 
 if __name__ == "__main__":
     main()
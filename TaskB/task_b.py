@@ -25,92 +25,93 @@ Phone: 0401234567
 Email: anna.virtanen@example.com
 
 """
-from datetime import datetime
 
-def print_reservation_number(reservation: list) -> None:
+from tasks.schema import get_converter
+
+def print_reservation_number(reservation: dict) -> None:
     """
     Prints the reservation number
 
     Parameters:
-     reservation (lst): reservation -> columns separated by |
+     reservation (dict): reservation converted with the booking format
     """
-    reservation_number = int(reservation[0])
+    reservation_number = reservation["reservationId"]
     print(f"Reservation number: {reservation_number}")
 
-def print_booker(reservation: list) -> None:
+def print_booker(reservation: dict) -> None:
     """
     Prints the booker
     """
-    booker = reservation[1]
+    booker = reservation["name"]
     print(f"Booker: {booker}")
     
-def print_date(reservation: list) -> None:
+def print_date(reservation: dict) -> None:
     """
     Prints the date
     """
-    day = datetime.strptime(reservation[2], "%Y-%m-%d").date()
+    day = reservation["reservationDate"]
     finnish_day = day.strftime("%d.%m.%Y")
     print(f"Date: {finnish_day}")
 
-def print_start_time(reservation: list) -> None:
+def print_start_time(reservation: dict) -> None:
     """
     Prints the start time
     """
-    time = datetime.strptime(reservation[3], "%H:%M").time()
+    time = reservation["reservationTime"]
     finnish_time = time.strftime("%H.%M")
     print(f"Start time: {finnish_time}")
 
-def print_hours(reservation: list) -> None: 
+def print_hours(reservation: dict) -> None: 
     """
     Prints the number of hours
     """
-    hours = int(reservation[4])
+    hours = reservation["durationHours"]
     print(f"Number of hours: {hours}")
     
-def print_hourly_rate(reservation: list) -> None:
+def print_hourly_rate(reservation: dict) -> None:
     """
     Prints the hourly rate
     """
-    hourly_rate = float(reservation[5])
+    hourly_rate = reservation["price"]
     hourly_rate_str = f"{hourly_rate:.2f}".replace('.', ',')
     print(f"Hourly rate: {hourly_rate_str} €")
 
-def print_total_price(reservation: list) -> None:
+def print_total_price(reservation: dict) -> None:
     """
     Prints the total price
     """
-    hours = int(reservation[4])
-    hourly_rate = float(reservation[5])
+    hours = reservation["durationHours"]
+    hourly_rate = reservation["price"]
     total_price = hours * hourly_rate
     total_price_str = f"{total_price:.2f}".replace('.', ',')
     print(f"Total price: {total_price_str} €")
 
-def print_paid(reservation: list) -> None:
+def print_paid(reservation: dict) -> None:
     """
     Prints whether the reservation is paid
     """
-    paid = bool(reservation[6])
+    paid = reservation["paid"]
     print(f"Paid: {'Yes' if paid else 'No'}")
 
-def print_venue(reservation: list) -> None:
+def print_venue(reservation: dict) -> None:
     """
     Prints the venue
     """
-    venue = reservation[7]
+    venue = reservation["reservedResource"]
     print(f"Venue: {venue}")
 
-def print_phone(reservation: list) -> None:
+def print_phone(reservation: dict) -> None:
     """
     Prints the phone number
     """
-    phone = reservation[8]
+    phone = reservation["phone"]
     print(f"Phone: {phone}")
 
-def print_email(reservation: list) -> None:
+def print_email(reservation: dict) -> None:
     """
     Prints the email
     """
-    email = reservation[9]
+    email = reservation["email"]
     print(f"Email: {email}")
 
 
@@ -122,10 +123,10 @@ def main():
     # Define the file name directly in the code
     reservations = "reservations.txt"
 
-    # Open the file, read it, and split the contents
+    # Open the file, read it, split the contents and convert the fields
     with open(reservations, "r", encoding="utf-8") as f:
         reservation = f.read().strip()
-        reservation = reservation.split('|')
+        reservation = get_converter("booking", "dict")(reservation.split('|'))
 
 
     print_reservation_number(reservation)
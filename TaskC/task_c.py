@@ -20,21 +20,33 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 
 """
 
-from datetime import datetime
-
-HEADERS = [
-    "reservationId",
-    "name",
-    "email",
-    "phone",
-    "reservationDate",
-    "reservationTime",
-    "durationHours",
-    "price",
-    "confirmed",
-    "reservedResource",
-    "createdAt",
-]
+from tasks.schema import HEADERS, get_converter
+from tasks.templates import Column, Layout
+
+_convert = get_converter("reservation", "list")
+
+# "- Moomin Valley, Forest Area 1, 12.11.2025 at 09.00"
+CONFIRMED_LAYOUT = Layout(
+    [
+        Column("name", field=1, gap="- "),
+        Column("reservedResource", field=9, gap=", "),
+        Column("reservationDate", "date", field=4, gap=", "),
+        Column("reservationTime", "time", field=5, gap=" at "),
+    ],
+    header=[],
+)
+
+# "- Little My Storm, 22.10.2025 at 15.45, duration 3 h, Red Room"
+LONG_LAYOUT = Layout(
+    [
+        Column("name", field=1, gap="- "),
+        Column("reservationDate", "date", field=4, gap=", "),
+        Column("reservationTime", "time", field=5, gap=" at "),
+        Column("durationHours", field=6, gap=", duration ", suffix=" h"),
+        Column("reservedResource", field=9, gap=", "),
+    ],
+    header=[],
+)
 
 
 def convert_reservation_data(reservation: list) -> list:
@@ -45,22 +57,9 @@ def convert_reservation_data(reservation: list) -> list:
      reservation (list): Unconverted reservation -> 11 columns
 
     Returns:
-     converted (list): Converted data types
+     converted (list): Converted data types in HEADERS order
     """
-    converted = []
-
-    converted.append(int(reservation[0]))  # reservationId (str -> int)
-    converted.append(reservation[1])  # name (str)
-    converted.append(reservation[2])  # email (str)
-    converted.append(reservation[3])  # phone (str)
-    converted.append(datetime.strptime(reservation[4], "%Y-%m-%d").date()) # reservationDate (date)
-    converted.append(datetime.strptime(reservation[5], "%H:%M").time())  # reservationTime (time)
-    converted.append(int(reservation[6]))  # durationHours (int)
-    converted.append(float(reservation[7]))  # price (float)
-    converted.append(reservation[8].strip() == "True")  # confirmed (bool)
-    converted.append(reservation[9])  # reservedResource (str)
-    converted.append(datetime.strptime(reservation[10].strip(), "%Y-%m-%d %H:%M:%S"))  # createdAt (datetime)
-    return converted
+    return _convert(reservation)
 
 
 def fetch_reservations(reservation_file: str) -> list:
@@ -89,11 +88,8 @@ def confirmed_reservations(reservations: list[list]) -> None:
     Parameters:
      reservations (list): Reservations
     """
-    for reservation in reservations:
-        if reservation[8]: 
-            date_str = reservation[4].strftime("%d.%m.%Y")
-            time_str = reservation[5].strftime("%H.%M")
-            print(f"- {reservation[1]}, {reservation[9]}, {date_str} at {time_str}")
+    for line in CONFIRMED_LAYOUT.render_text(r for r in reservations if r[8]):
+        print(line)
 
 
 def long_reservations(reservations: list[list]) -> None:
@@ -103,11 +99,8 @@ def long_reservations(reservations: list[list]) -> None:
     Parameters:
      reservations (list): Reservations
     """
-    for reservation in reservations:
-        if reservation[6] >= 3:  
-            date_str = reservation[4].strftime("%d.%m.%Y")
-            time_str = reservation[5].strftime("%H.%M")
-            print(f"- {reservation[1]}, {date_str} at {time_str}, duration {reservation[6]} h, {reservation[9]}")
+    for line in LONG_LAYOUT.render_text(r for r in reservations if r[6] >= 3):
+        print(line)
 
 
 def confirmation_statuses(reservations: list[list]) -> None:
@@ -0,0 +1,219 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Phase-imbalance and net-energy analytics for the weekly meter files.
+
+All metrics are derived from the value columns of a week file as arrays:
+
+- phase imbalance per hour and per day (max deviation from the phase mean, %)
+- net consumption per phase per hour and per day (consumption - production, Wh)
+- self-consumption ratio per hour and per day (share of production used on site)
+- week-over-week deltas of the weekly totals, per phase
+"""
+
+import operator
+from array import array
+from datetime import date, datetime
+from functools import reduce
+from itertools import groupby
+
+from task_e import format_comma, read_data, write_report
+from tasks.templates import Column, Layout
+
+# Rows: (date, imbalance %, net1-3 in Wh, self-consumption share)
+ANALYTICS_LAYOUT = Layout(
+    [
+        Column("day", "weekday", 12, field=0),
+        Column("date", "date", 12, field=0),
+        Column("imbalance", "number", 7, field=1),
+        Column("net1", "number", 7, divisor=1000, field=2, gap="   "),
+        Column("net2", "number", 7, divisor=1000, field=3),
+        Column("net3", "number", 7, divisor=1000, field=4),
+        Column("self_consumption", "percent", 10, field=5, gap="   "),
+    ],
+    header=[
+        "Day          Date        Imbalance   Net consumption [kWh]     Self-consumption",
+        "            (dd.mm.yyyy)    [%]       v1      v2      v3         [%]",
+        "-" * 80,
+    ],
+)
+
+# Rows: (week number, cons1-3, prod1-3, net1-3 in Wh)
+WEEK_OVER_WEEK_LAYOUT = Layout(
+    [
+        Column("week", "text", 6),
+        Column("cons1", "number", 7, divisor=1000),
+        Column("cons2", "number", 7, divisor=1000),
+        Column("cons3", "number", 7, divisor=1000),
+        Column("prod1", "number", 7, divisor=1000, gap="   "),
+        Column("prod2", "number", 7, divisor=1000),
+        Column("prod3", "number", 7, divisor=1000),
+        Column("net1", "number", 7, divisor=1000, gap="   "),
+        Column("net2", "number", 7, divisor=1000),
+        Column("net3", "number", 7, divisor=1000),
+    ],
+    header=[
+        "Week      Consumption [kWh]        Production [kWh]        Net consumption [kWh]",
+        "            v1      v2      v3        v1      v2      v3        v1      v2      v3",
+        "-" * 82,
+    ],
+)
+
+
+def phase_imbalance(v1: float, v2: float, v3: float) -> float:
+    """Returns the phase imbalance in percent (max deviation from the mean)."""
+    mean = (v1 + v2 + v3) / 3.0
+    if mean <= 0.0:
+        return 0.0
+    deviation = max(abs(v1 - mean), abs(v2 - mean), abs(v3 - mean))
+    return deviation / mean * 100.0
+
+
+def analyze_week(rows: list[list[str]]) -> dict:
+    """
+    Computes all analytics of one week file from its columns.
+
+    The six value columns are converted into arrays once. The hourly
+    metrics are mapped over whole columns, and the daily sums are taken
+    over each day's run of rows, adding in row order like daily_totals.
+
+    Returns a dict with:
+     "hours" (list[datetime]): timestamps of the hourly rows
+     "hourly_imbalance" (array): consumption imbalance per hour (%)
+     "hourly_net" (list[array]): net consumption per hour, one array per phase (Wh)
+     "hourly_self_consumption" (array): self-consumption share per hour (0-1)
+     "daily" (dict[date, list[float]]): cons1-3, prod1-3, self-used1-3 (Wh)
+     "daily_imbalance" (dict[date, float]): consumption imbalance per day (%)
+     "totals" (list[float]): weekly cons1-3, prod1-3, self-used1-3 (Wh)
+    """
+    data = rows[1:]
+    if not data:
+        return {"hours": [], "hourly_imbalance": array("d"), "hourly_net": [array("d") for _ in range(3)],
+                "hourly_self_consumption": array("d"), "daily": {}, "daily_imbalance": {}, "totals": [0.0] * 9}
+
+    times, *cells = list(zip(*data))[0:7]
+    hours = list(map(datetime.fromisoformat, times))
+    # cons1-3, prod1-3, then the production used on site during the hour, per phase
+    columns = [array("d", map(float, column)) for column in cells]
+    columns += [array("d", map(min, columns[i], columns[i + 3])) for i in range(3)]
+    hourly_imbalance = array("d", map(phase_imbalance, columns[0], columns[1], columns[2]))
+    hourly_net = [array("d", map(operator.sub, columns[i], columns[i + 3])) for i in range(3)]
+    hourly_self_consumption = array("d", map(self_consumption_ratio, zip(*columns)))
+
+    daily: dict[date, list[float]] = {}
+    start = 0
+    for d, run in groupby(map(datetime.date, hours)):
+        end = start + len(list(run))
+        # A day split over several runs (unsorted rows) continues from its earlier sums
+        day = daily.get(d, [0.0] * 9)
+        daily[d] = [reduce(operator.add, column[start:end], total) for column, total in zip(columns, day)]
+        start = end
+
+    totals = [0.0] * 9
+    daily_imbalance: dict[date, float] = {}
+    for d, day in daily.items():
+        daily_imbalance[d] = phase_imbalance(day[0], day[1], day[2])
+        for i in range(9):
+            totals[i] += day[i]
+
+    return {
+        "hours": hours,
+        "hourly_imbalance": hourly_imbalance,
+        "hourly_net": hourly_net,
+        "hourly_self_consumption": hourly_self_consumption,
+        "daily": daily,
+        "daily_imbalance": daily_imbalance,
+        "totals": totals,
+    }
+
+
+def net_consumption(values: list[float]) -> list[float]:
+    """Returns the net consumption (consumption - production) of each phase."""
+    return [values[0] - values[3], values[1] - values[4], values[2] - values[5]]
+
+
+def self_consumption_ratio(values: list[float]) -> float:
+    """Returns the share (0-1) of the production that was consumed on site."""
+    production = values[3] + values[4] + values[5]
+    if production <= 0.0:
+        return 0.0
+    return (values[6] + values[7] + values[8]) / production
+
+
+def week_over_week(weeks: list[tuple[int, dict]]) -> list[tuple[int, list[float]]]:
+    """
+    Returns the change of the weekly totals compared to the previous week.
+
+    Parameters:
+     weeks (list): (week number, analyze_week result) in chronological order
+
+    Returns:
+     deltas (list): (week number, [cons1-3, prod1-3, net1-3] deltas in Wh) from the second week on
+    """
+    deltas: list[tuple[int, list[float]]] = []
+    for (_, prev), (week_no, curr) in zip(weeks, weeks[1:]):
+        change = [c - p for c, p in zip(curr["totals"][0:6], prev["totals"][0:6])]
+        deltas.append((week_no, change + net_consumption(change)))
+    return deltas
+
+
+def format_percent(value: float) -> str:
+    """Formats a share (0-1) as a percentage with a comma as decimal separator."""
+    return format_comma(value * 100.0) + " %"
+
+
+def analytics_section(week_no: int, analytics: dict) -> str:
+    """Builds the weekly analytics report section as text."""
+    daily = analytics["daily"]
+    daily_imbalance = analytics["daily_imbalance"]
+
+    lines: list[str] = []
+    lines.append(f"Week {week_no} phase imbalance and net consumption (kWh, by phase)")
+    rows = [(d, daily_imbalance[d], *net_consumption(daily[d]), self_consumption_ratio(daily[d]))
+            for d in sorted(daily.keys())]
+    lines.extend(ANALYTICS_LAYOUT.render_text(rows))
+
+    hourly = analytics["hourly_imbalance"]
+    peak = max(range(len(hourly)), key=hourly.__getitem__) if hourly else None
+    lines.append("")
+    lines.append(f"- Weekly imbalance: {format_comma(phase_imbalance(*analytics['totals'][0:3]))} %")
+    if peak is not None:
+        peak_str = analytics["hours"][peak].strftime("%d.%m.%Y %H.%M")
+        lines.append(f"- Highest hourly imbalance: {format_comma(hourly[peak])} % ({peak_str})")
+    lines.append(f"- Self-consumption ratio: {format_percent(self_consumption_ratio(analytics['totals']))}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def week_over_week_section(deltas: list[tuple[int, list[float]]]) -> str:
+    """Builds the week-over-week change section as text."""
+    lines: list[str] = []
+    lines.append("Week-over-week change (kWh)")
+    lines.extend(WEEK_OVER_WEEK_LAYOUT.render_text((week_no, *values) for week_no, values in deltas))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Main function: analyzes the 3 week files and writes the analytics report."""
+
+    weeks = [
+        (41, "week41.csv"),
+        (42, "week42.csv"),
+        (43, "week43.csv"),
+    ]
+
+    analyzed: list[tuple[int, dict]] = []
+    parts: list[str] = []
+    for week_no, filename in weeks:
+        analytics = analyze_week(read_data(filename))
+        analyzed.append((week_no, analytics))
+        parts.append(analytics_section(week_no, analytics))
+
+    parts.append(week_over_week_section(week_over_week(analyzed)))
+    write_report("analytics.txt", "\n".join(parts))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@
 import csv
 from datetime import datetime
 
-days_en = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+from tasks.templates import Column, Layout
 
 
 def read_data(filename: str) -> list[list[str]]:
@@ -17,11 +17,6 @@ def read_data(filename: str) -> list[list[str]]:
     return rows
 
 
-def wh_to_kwh(wh: float) -> float:
-    """Converts Wh to kWh."""
-    return wh / 1000.0
-
-
 def format_comma(value: float) -> str:
     """Formats number with 2 decimals and comma as decimal separator."""
     return f"{value:.2f}".replace(".", ",")
@@ -47,32 +42,72 @@ def daily_totals(rows: list[list[str]]) -> dict:
 
     return daily
 
+def whole_wh(cell: str) -> int:
+    """Parses a Wh cell that must hold a whole number ("442", also "442.0")."""
+    try:
+        return int(cell)
+    except ValueError:
+        value = float(cell)
+        if not value.is_integer():
+            raise ValueError(f"daily_totals_wh needs whole Wh, got {cell!r}; use daily_totals") from None
+        return int(value)
+
+def daily_totals_wh(rows: list[list[str]]) -> dict:
+    """
+    Returns daily totals as whole Wh (integer accumulation, exact).
+
+    The meter files have whole Wh in every cell. A fractional cell raises
+    ValueError instead of being rounded; daily_totals takes any number.
+    """
+    daily = {}
+
+    for row in rows[1:]:
+        d = datetime.fromisoformat(row[0]).date()
+
+        if d not in daily:
+            daily[d] = [0, 0, 0, 0, 0, 0]  # cons1-3, prod1-3 (Wh)
+
+        daily[d][0] += whole_wh(row[1])
+        daily[d][1] += whole_wh(row[2])
+        daily[d][2] += whole_wh(row[3])
+        daily[d][3] += whole_wh(row[4])
+        daily[d][4] += whole_wh(row[5])
+        daily[d][5] += whole_wh(row[6])
+
+    return daily
+
+# Rows: (date, cons1-3, prod1-3 in Wh)
+WEEK_LAYOUT = Layout(
+    [
+        Column("day", "weekday", 12, field=0),
+        Column("date", "date", 12, field=0),
+        Column("cons1", "number", 7, divisor=1000, field=1),
+        Column("cons2", "number", 7, divisor=1000, field=2),
+        Column("cons3", "number", 7, divisor=1000, field=3),
+        Column("prod1", "number", 7, divisor=1000, field=4, gap="   "),
+        Column("prod2", "number", 7, divisor=1000, field=5),
+        Column("prod3", "number", 7, divisor=1000, field=6),
+    ],
+    header=[
+        "Day          Date        Consumption [kWh]               Production [kWh]",
+        "            (dd.mm.yyyy)  v1      v2      v3             v1     v2     v3",
+        "-" * 75,
+    ],
+)
+
+
+def week_rows(daily: dict) -> list[tuple]:
+    """Returns the daily totals as WEEK_LAYOUT rows in date order."""
+    return [(d, *daily[d]) for d in sorted(daily.keys())]
+
+
 def week_section(week_no: int, daily: dict) -> str:
     """Builds the weekly electricity consumption and production report section as text."""
 
     lines: list[str] = []
 
     lines.append(f"Week {week_no} electricity consumption and production (kWh, by phase)")
-    lines.append("Day          Date        Consumption [kWh]               Production [kWh]")
-    lines.append("            (dd.mm.yyyy)  v1      v2      v3             v1     v2     v3")
-    lines.append("-" * 75)
-
-    for d in sorted(daily.keys()):
-        cons1 = format_comma(wh_to_kwh(daily[d][0]))
-        cons2 = format_comma(wh_to_kwh(daily[d][1]))
-        cons3 = format_comma(wh_to_kwh(daily[d][2]))
-        prod1 = format_comma(wh_to_kwh(daily[d][3]))
-        prod2 = format_comma(wh_to_kwh(daily[d][4]))
-        prod3 = format_comma(wh_to_kwh(daily[d][5]))
-
-        weekday = days_en[d.weekday()]
-        date_str = d.strftime("%d.%m.%Y")
-
-        lines.append(
-            f"{weekday:<12} {date_str:<12} "
-            f"{cons1:>7} {cons2:>7} {cons3:>7}   "
-            f"{prod1:>7} {prod2:>7} {prod3:>7}"
-        )
+    lines.extend(WEEK_LAYOUT.render_text(week_rows(daily)))
     lines.append("")
     return "\n".join(lines)
 
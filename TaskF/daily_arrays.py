@@ -0,0 +1,247 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Compact daily totals: one array('d') per field, indexed by date ordinal.
+
+calculate_daily_totals returns dict[date, list[float]], which costs a date,
+a list and four floats per day, about 250 bytes for 32 bytes of data.
+DailyArrays keeps the same totals in contiguous columns: day i of the
+columns is the date with ordinal first + i, and a byte per day marks the
+days that have data. It reads like the dict (daily[d], for d in daily,
+items(), len, in), so the report functions of task_f.py and TaskE's
+week_section work on it unchanged. Rows are built on access as new lists,
+so writes to them do not change the store; use add instead.
+
+Usage: python -m tasks taskf daily-arrays [sites] [years]
+"""
+
+import operator
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import ItemsView, Mapping, ValuesView
+from datetime import date, datetime
+from functools import reduce
+from itertools import compress, repeat
+
+from task_f import calculate_daily_totals, create_yearly_report, read_data
+from timestamps import best_time
+
+
+class _Dates(dict):
+    """Dates by ordinal, shared by all stores so iterating does not build new date objects."""
+
+    def __missing__(self, ordinal: int) -> date:
+        d = self[ordinal] = date.fromordinal(ordinal)
+        return d
+
+
+_DATES = _Dates()
+
+
+class _Rows(ValuesView):
+    """values() of a DailyArrays store: the rows are zipped from the columns instead of looked up."""
+
+    def __iter__(self):
+        store = self._mapping
+        rows = zip(*store.columns) if store.columns else repeat((), len(store.present))
+        return compress(map(list, rows), store.present)
+
+
+class _Days(ItemsView):
+    """items() of a DailyArrays store, in date order."""
+
+    def __iter__(self):
+        return zip(self._mapping, _Rows(self._mapping))
+
+
+class DailyArrays(Mapping):
+    """Daily totals of width fields per day in date-ordinal columns."""
+
+    def __init__(self, width: int):
+        self.width = width
+        self.first = 0  # ordinal of day 0
+        self.columns = [array("d") for _ in range(width)]
+        self.present = bytearray()
+        self._days = 0
+
+    @classmethod
+    def from_mapping(cls, daily: Mapping, width: int | None = None) -> "DailyArrays":
+        """Copies a dict of daily totals (e.g. from calculate_daily_totals or daily_totals)."""
+        if width is None:
+            width = len(next(iter(daily.values()))) if daily else 0
+        store = cls(width)
+        for d, values in daily.items():
+            store.add(d, values)
+        return store
+
+    def _index(self, ordinal: int) -> int:
+        """Column index of a date ordinal, growing the columns to cover it."""
+        days = len(self.present)
+        if not days:
+            self.first = ordinal
+        index = ordinal - self.first
+        if index < 0:
+            for column in self.columns:
+                column[0:0] = array("d", bytes(8 * -index))
+            self.present[0:0] = bytes(-index)
+            self.first = ordinal
+            return 0
+        if index >= days:
+            for column in self.columns:
+                column.extend(array("d", bytes(8 * (index + 1 - days))))
+            self.present.extend(bytes(index + 1 - days))
+        return index
+
+    def add(self, d: date, values) -> None:
+        """Adds values to the totals of a day, field by field."""
+        i = self._index(d.toordinal())
+        for column, value in zip(self.columns, values):
+            column[i] += value
+        if not self.present[i]:
+            self.present[i] = 1
+            self._days += 1
+
+    def _position(self, d: date) -> int:
+        try:
+            i = d.toordinal() - self.first
+        except (AttributeError, TypeError):
+            # not a date, like a missing key of a dict
+            raise KeyError(d) from None
+        if 0 <= i < len(self.present) and self.present[i]:
+            return i
+        raise KeyError(d)
+
+    def __getitem__(self, d: date) -> list[float]:
+        return list(map(operator.getitem, self.columns, repeat(self._position(d), self.width)))
+
+    def __contains__(self, d: object) -> bool:
+        try:
+            self._position(d)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return map(_DATES.__getitem__, compress(range(self.first, self.first + len(self.present)), self.present))
+
+    def __len__(self) -> int:
+        return self._days
+
+    def values(self) -> ValuesView:
+        """The rows of the days with data, in date order."""
+        return _Rows(self)
+
+    def items(self) -> ItemsView:
+        """(date, row) pairs of the days with data, in date order."""
+        return _Days(self)
+
+    def column(self, field: int, start: date | None = None, end: date | None = None) -> array:
+        """One field of the days from start to end (inclusive); days without data are 0.0."""
+        first = 0 if start is None else max(0, start.toordinal() - self.first)
+        last = len(self.present) if end is None else max(0, end.toordinal() - self.first + 1)
+        return self.columns[field][first:last]
+
+    def totals(self, start: date | None = None, end: date | None = None) -> list[float]:
+        """
+        Sums of every field from start to end (inclusive).
+
+        Summed in date order like the report loops over the dict, so the
+        results are the same to the last bit; empty days add 0.0.
+        """
+        return [reduce(operator.add, self.column(field, start, end), 0.0) for field in range(self.width)]
+
+    def nbytes(self) -> int:
+        """Bytes used by the columns and the presence flags."""
+        return sum(column.itemsize * len(column) for column in self.columns) + len(self.present)
+
+
+def calculate_daily_totals_arrays(rows: list[list[str]]) -> DailyArrays:
+    """calculate_daily_totals into a DailyArrays store, with the same additions in the same order."""
+    daily = DailyArrays(4)
+    days: dict[str, date] = {}
+    for row in rows[1:]:
+        stamp = row[0].strip()
+        # The date part is all that is needed; parse each day once
+        d = days.get(stamp[:10])
+        if d is None:
+            d = days[stamp[:10]] = datetime.fromisoformat(stamp).date()
+        daily.add(d, (
+            float(row[1].strip().replace(",", ".")),
+            float(row[2].strip().replace(",", ".")),
+            float(row[3].strip().replace(",", ".")),
+            1.0,
+        ))
+    return daily
+
+
+def site_history(daily: dict[date, list[float]], years: int, scale: float) -> dict[date, list[float]]:
+    """A multi-year dict history: the year of daily totals repeated up to 2025, scaled."""
+    history = {}
+    for year in range(2026 - years, 2026):
+        for d, values in daily.items():
+            if d.year == 2025:
+                history[date(year, d.month, d.day)] = [v * scale for v in values[:3]] + [values[3]]
+    return history
+
+
+def measured(build) -> tuple[object, int, float]:
+    """Result, traced memory in bytes and seconds of a build function."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main() -> None:
+    """Main function: compares memory and iteration speed with the dict of lists."""
+    sites = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    rows = read_data("2025.csv")
+    reference = calculate_daily_totals(rows)
+    store = calculate_daily_totals_arrays(rows)
+    print(f"2025.csv: same totals as calculate_daily_totals: {dict(store.items()) == reference}, "
+          f"same yearly report: {create_yearly_report(store) == create_yearly_report(reference)}")
+
+    scales = [0.5 + (i % 100) / 50 for i in range(sites)]
+    dicts, dict_bytes, _ = measured(lambda: [site_history(reference, years, s) for s in scales])
+    stores, store_bytes, _ = measured(lambda: [DailyArrays.from_mapping(h) for h in dicts])
+    days = sum(map(len, dicts))
+    print(f"\n{sites} sites x {years} years, {days} days:")
+    print(f"- dict of lists: {dict_bytes / 2**20:7.1f} MB, {dict_bytes / days:5.0f} bytes/day")
+    print(f"- DailyArrays:   {store_bytes / 2**20:7.1f} MB, {store_bytes / days:5.0f} bytes/day "
+          f"({dict_bytes / store_bytes:.1f}x smaller)")
+
+    def yearly(histories):
+        return [create_yearly_report(h) for h in histories]
+
+    def walk(histories):
+        for h in histories:
+            for _, values in h.items():
+                values[0]
+
+    dict_report = best_time(yearly, dicts)
+    store_report = best_time(yearly, stores)
+    dict_walk = best_time(walk, dicts)
+    store_walk = best_time(walk, stores)
+    first, last = date(2025, 1, 1), date(2025, 12, 31)
+    column_sums = best_time(lambda: [s.totals(first, last) for s in stores])
+    same = yearly(dicts) == yearly(stores)
+    exact = all(s.totals(first, last)[:2] == [sum(v[0] for d, v in h.items() if d.year == 2025),
+                                              sum(v[1] for d, v in h.items() if d.year == 2025)]
+                for s, h in zip(stores[:10], dicts[:10]))
+    print(f"Yearly reports (dict interface): dict {dict_report * 1000:.0f} ms, "
+          f"DailyArrays {store_report * 1000:.0f} ms, same lines: {same}")
+    print(f"items() walk: dict {dict_walk * 1000:.0f} ms, DailyArrays {store_walk * 1000:.0f} ms")
+    print(f"Year totals from the columns: {column_sums * 1000:.0f} ms "
+          f"({dict_report / column_sums:.0f}x faster than the dict report loop), same sums: {exact}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Fast reader for the Finnish meter CSV format: ; as the field separator and
+a comma as the decimal separator (1,569).
+
+The whole file is read as one buffer, the decimal commas are replaced with
+dots in one go and the cells are split into columns by striding, so every
+numeric column is converted with a single float() call per cell.
+read_data + calculate_daily_totals in task_f.py stay the reference.
+"""
+
+import csv
+import io
+from array import array
+from itertools import repeat
+from datetime import date, tzinfo
+
+from task_f import calculate_daily_totals, read_data
+from timestamps import DEFAULT_TIMEZONE, best_time, daily_totals_from_columns, decode_timestamps
+
+
+def split_columns(text: str) -> tuple[list[str], list[list[str]]]:
+    """
+    Splits the CSV text into the header and the columns of cells.
+
+    Falls back to the csv module when the text has quoted cells or rows
+    with a different number of fields than the header.
+    """
+    text = text.strip("\n")
+    header_line, _, body = text.partition("\n")
+    header = header_line.split(";")
+    width = len(header)
+
+    if not body:
+        return header, [[] for _ in header]
+
+    lines = body.split("\n")
+    if '"' not in body and set(map(str.count, lines, repeat(";"))) == {width - 1}:
+        cells = ";".join(lines).split(";")
+        return header, [cells[i::width] for i in range(width)]
+
+    # Irregular file: go through the csv module row by row
+    rows = list(csv.reader(io.StringIO(body), delimiter=";"))
+    if any(len(row) != width for row in rows):
+        raise ValueError("Every row must have as many fields as the header")
+    return header, [list(column) for column in zip(*rows)]
+
+
+def read_columns(filename: str) -> tuple[list[str], list[str], list[array]]:
+    """
+    Reads a meter CSV file into typed columns.
+
+    Returns:
+     header (list[str]): Column names
+     times (list[str]): Timestamp column as text
+     values (list[array]): One array of floats per numeric column
+    """
+    with open(filename, "r", encoding="utf-8", newline="") as f:
+        text = f.read().replace("\r\n", "\n")
+
+    header, columns = split_columns(text.replace(",", "."))
+    values = [array("d", map(float, column)) for column in columns[1:]]
+    return header, columns[0], values
+
+
+def calculate_daily_totals_from_file(filename: str,
+                                     tz: str | tzinfo = DEFAULT_TIMEZONE) -> dict[date, list[float]]:
+    """Reads a meter file with read_columns and calculates its daily totals."""
+    _, times, values = read_columns(filename)
+    return daily_totals_from_columns(decode_timestamps(times), values[0:3], tz)
+
+
+def convert_columns(rows: list[list[str]]) -> list[list[float]]:
+    """Converts the numeric columns of read_data rows cell by cell (reference)."""
+    return [
+        [float(row[i].strip().replace(",", ".")) for row in rows[1:]]
+        for i in range(1, len(rows[0]))
+    ]
+
+
+def main() -> None:
+    """Main function: compares the fast reader with read_data + calculate_daily_totals."""
+    filename = "2025.csv"
+
+    reference_read = best_time(lambda: convert_columns(read_data(filename)))
+    fast_read = best_time(read_columns, filename)
+    reference_total = best_time(lambda: calculate_daily_totals(read_data(filename)))
+    fast_total = best_time(calculate_daily_totals_from_file, filename)
+
+    rows = read_data(filename)
+    _, times, values = read_columns(filename)
+
+    print(f"Rows: {len(times)}")
+    print(f"Read + convert:       reference {reference_read * 1000:.1f} ms, "
+          f"read_columns {fast_read * 1000:.1f} ms ({reference_read / fast_read:.1f}x)")
+    print(f"File to daily totals: reference {reference_total * 1000:.1f} ms, "
+          f"fast {fast_total * 1000:.1f} ms ({reference_total / fast_total:.1f}x)")
+    print(f"Same values as per-cell conversion: {[list(v) for v in values] == convert_columns(rows)}")
+    print(f"Same daily totals: {calculate_daily_totals_from_file(filename) == calculate_daily_totals(rows)}")
+
+
+if __name__ == "__main__":
+    main()
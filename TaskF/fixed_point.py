@@ -0,0 +1,151 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Fixed-point integer accumulation for the energy totals.
+
+The meter values have three decimals (1,569 kWh), so they are kept as
+integers in thousandths: Wh for energy and m°C for temperature. Sums of
+integers are exact and match the meter operator's figures; the values are
+turned into decimal text only when the report is rendered.
+"""
+
+import operator
+import re
+from array import array
+from datetime import date, datetime
+from fractions import Fraction
+from itertools import groupby, repeat
+
+from fast_csv import calculate_daily_totals_from_file, read_columns
+from task_f import calculate_daily_totals, format_comma, read_data
+from timestamps import best_time
+
+# Number of decimals kept in the integers (1,569 kWh -> 1569 Wh)
+DECIMALS = 3
+SCALE = 10 ** DECIMALS
+
+# A decimal number with comma or dot as separator: sign, whole part, decimals (no exponents)
+DECIMAL = re.compile(r"([+-]?)(?:(\d+)(?:[.,](\d*))?|[.,](\d+))")
+
+
+def parse_fixed(s: str, decimals: int = DECIMALS) -> int:
+    """
+    Parses a decimal number (comma or dot as separator) into an integer
+    scaled by 10 ** decimals. Extra decimals are rounded half away from zero.
+    Like float(), raises ValueError for empty or malformed cells.
+    """
+    match = DECIMAL.fullmatch(s.strip())
+    if match is None:
+        raise ValueError(f"could not convert string to fixed point: {s!r}")
+    sign, whole, frac = match.group(1), match.group(2) or "0", match.group(3) or match.group(4) or ""
+
+    value = int(whole) * 10 ** decimals
+    if frac:
+        value += int(frac[:decimals].ljust(decimals, "0"))
+        if len(frac) > decimals and frac[decimals] >= "5":
+            value += 1
+    return -value if sign == "-" else value
+
+
+def parse_fixed_column(column: list[str], decimals: int = DECIMALS) -> array:
+    """
+    Parses a column of decimal numbers into scaled integers.
+
+    When every cell has the same number of decimals, the separators are
+    dropped from the whole column at once and the digits read as integers;
+    int() rejects the same bad cells as parse_fixed (an empty cell has no
+    separator, so such columns go cell by cell).
+    """
+    if column:
+        first = column[0].strip()
+        places = len(first) - first.find(",") - 1 if "," in first else -1
+        if 0 < places <= decimals:
+            separator = operator.itemgetter(slice(-places - 1, -places))
+            joined = ";".join(column)
+            if "_" not in joined and all(map(str.__eq__, map(separator, map(str.rstrip, column)), repeat(","))):
+                digits = map(int, joined.replace(",", "").split(";"))
+                if places == decimals:
+                    return array("q", digits)
+                return array("q", map((10 ** (decimals - places)).__mul__, digits))
+    return array("q", [parse_fixed(s, decimals) for s in column])
+
+
+def format_fixed(value: int, decimals: int = DECIMALS, digits: int = 2) -> str:
+    """
+    Formats a scaled integer with `digits` decimals and a comma as decimal
+    separator, rounding half away from zero without going through floats.
+    """
+    step = 10 ** (decimals - digits)
+    rounded = (abs(value) + step // 2) // step
+    whole, frac = divmod(rounded, 10 ** digits)
+    sign = "-" if value < 0 and rounded else ""
+    if digits == 0:
+        return f"{sign}{whole}"
+    return f"{sign}{whole},{frac:0{digits}d}"
+
+
+def calculate_daily_totals_fixed(rows: list[list[str]]) -> dict[date, list[int]]:
+    """
+    Integer mode of calculate_daily_totals: the same rows grouped by the
+    same days (the date of each timestamp), with consumption and production
+    in Wh, the temperature sum in m°C and the number of hours.
+    """
+    if len(rows) < 2:
+        return {}
+    stamps, cons, prod, temp = list(zip(*rows[1:]))[0:4]
+    cons, prod, temp = (parse_fixed_column(column) for column in (cons, prod, temp))
+
+    daily: dict[date, list[int]] = {}
+    days: dict[str, date] = {}
+    start = 0
+    for key, run in groupby(stamps, key=lambda stamp: stamp.strip()[:10]):
+        end = start + len(list(run))
+        d = days.get(key)
+        if d is None:
+            d = days[key] = datetime.fromisoformat(stamps[start].strip()).date()
+        # A day split over several runs (unsorted rows) continues from its earlier sums
+        day = daily.get(d, [0, 0, 0, 0])
+        daily[d] = [day[0] + sum(cons[start:end]), day[1] + sum(prod[start:end]),
+                    day[2] + sum(temp[start:end]), day[3] + end - start]
+        start = end
+    return daily
+
+
+def main() -> None:
+    """Main function: compares fixed-point and float accumulation over 2025.csv."""
+    filename = "2025.csv"
+
+    float_time = best_time(lambda: calculate_daily_totals(read_data(filename)))
+    columnar_time = best_time(calculate_daily_totals_from_file, filename)
+    fixed_time = best_time(lambda: calculate_daily_totals_fixed(read_data(filename)))
+
+    daily_float = calculate_daily_totals(read_data(filename))
+    daily_fixed = calculate_daily_totals_fixed(read_data(filename))
+
+    float_cons = sum(v[0] for v in daily_float.values())
+    fixed_cons = sum(v[0] for v in daily_fixed.values())
+
+    # exact yearly total straight from the file, for checking both paths
+    _, _, values = read_columns(filename)
+    exact_cons = sum(Fraction(v).limit_denominator(SCALE) for v in values[0])
+
+    rows = len(values[0])
+    print(f"Rows: {rows}, days: {len(daily_fixed)}")
+    print(f"Throughput: float row by row {rows / float_time / 1e6:.2f} M rows/s, "
+          f"float columnar {rows / columnar_time / 1e6:.2f} M rows/s, "
+          f"fixed-point {rows / fixed_time / 1e6:.2f} M rows/s")
+    print(f"Yearly consumption: float {float_cons!r} kWh -> {format_comma(float_cons)}")
+    print(f"                    fixed {fixed_cons} Wh -> {format_fixed(fixed_cons)}")
+    print(f"Fixed-point total exact: {Fraction(fixed_cons, SCALE) == exact_cons}, "
+          f"float error: {float(Fraction(float_cons) - exact_cons):.3g} kWh")
+
+    mismatches = [
+        d for d in daily_fixed
+        if format_fixed(daily_fixed[d][0]) != format_comma(daily_float[d][0])
+    ]
+    print(f"Days where float rendering differs from exact rounding: {len(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
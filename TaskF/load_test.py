@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Load test for report_server.py.
+
+Starts the server in this process (or uses a running one with --url),
+sends requests from many client threads over keep-alive connections and
+prints the throughput and latency percentiles.
+
+Usage: python -m tasks taskf loadtest [clients] [requests per client] [--url http://127.0.0.1:8025]
+"""
+
+import http.client
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from report_server import create_server
+
+PATHS = [
+    "/yearly",
+    "/monthly?month=3",
+    "/monthly?month=7&format=text",
+    "/daily?start=01.03.2025&end=31.03.2025",
+    "/weekly?week=42",
+    "/weekly?format=text",
+]
+
+
+def run_client(host: str, port: int, requests: int, latencies: list[float], errors: list[str]) -> None:
+    """Sends requests over one keep-alive connection and records the latencies."""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    for i in range(requests):
+        path = PATHS[i % len(PATHS)]
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(f"{path}: {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{path}: {e}")
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Returns the p-th percentile (0-100) of sorted values."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def parse_args(argv: list[str]) -> tuple[list[str], str | None]:
+    """Splits the arguments into the positional ones and the --url value (--url URL or --url=URL)."""
+    args: list[str] = []
+    url = None
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--url":
+            if i + 1 == len(argv):
+                sys.exit("--url needs a value")
+            url = argv[i + 1]
+            i += 2
+            continue
+        if argv[i].startswith("--url="):
+            url = argv[i].split("=", 1)[1]
+        else:
+            args.append(argv[i])
+        i += 1
+    return args, url
+
+
+def main() -> None:
+    """Main function: runs the load test and prints the results."""
+    args, url = parse_args(sys.argv[1:])
+    clients = int(args[0]) if len(args) > 0 else 16
+    requests = int(args[1]) if len(args) > 1 else 200
+
+    server = None
+    if url is None:
+        server = create_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[0:2]
+    else:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    threads = [
+        threading.Thread(target=run_client, args=(host, port, requests, latencies, errors))
+        for _ in range(clients)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.shutdown()
+        server.service.stop()
+        server.server_close()
+
+    latencies.sort()
+    print(f"Clients: {clients}, requests: {len(latencies)} ok, {len(errors)} failed")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    for p in (50, 95, 99):
+        print(f"p{p}: {percentile(latencies, p) * 1000:.2f} ms")
+    if errors:
+        print("First errors: " + "; ".join(errors[:5]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Local HTTP report service for the TaskF yearly data and the TaskE weeks.
+
+The meter files are read and aggregated once and the reports are kept in
+memory; a watcher thread reloads them when a file changes. Reports are
+served as JSON (default) or text:
+
+GET /yearly
+GET /monthly?month=3
+GET /daily?start=01.03.2025&end=31.03.2025
+GET /weekly?week=42          (all weeks without week=)
+GET /health
+
+Add format=text to get the report lines as plain text.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from task_f import (calculate_daily_totals, create_yearly_report, daily_report, monthly_report,
+                    parse_fi_date, read_data)
+
+from tasks import TASK_DIRS, import_task
+
+task_e = import_task("taske", "task_e")
+
+TASK_F_DIR = Path(__file__).resolve().parent
+TASK_E_DIR = Path(TASK_DIRS["taske"])
+
+DEFAULT_PORT = 8025
+RELOAD_INTERVAL = 1.0  # seconds between file change checks
+
+
+class ReportData:
+    """Aggregated meter data and the prebuilt reports of one load."""
+
+    def __init__(self, year_file: Path, week_dir: Path):
+        self.year_file = year_file
+        self.week_files = sorted(week_dir.glob("week*.csv"))
+        self.mtimes = self.file_mtimes()
+
+        self.daily = calculate_daily_totals(read_data(str(year_file)))
+        self.yearly = create_yearly_report(self.daily)
+        self.monthly = {month: monthly_report(self.daily, month) for month in range(1, 13)}
+
+        self.weekly: dict[int, list[str]] = {}
+        for filename in self.week_files:
+            week_no = int(filename.stem.removeprefix("week"))
+            daily = task_e.daily_totals(task_e.read_data(str(filename)))
+            self.weekly[week_no] = task_e.week_section(week_no, daily).split("\n")
+
+    def file_mtimes(self) -> dict[Path, float]:
+        """Returns the modification times of the data files."""
+        return {path: path.stat().st_mtime for path in [self.year_file, *self.week_files]}
+
+    def is_stale(self, week_dir: Path) -> bool:
+        """Checks whether a data file has changed, appeared or disappeared since the load."""
+        if sorted(week_dir.glob("week*.csv")) != self.week_files:
+            return True
+        try:
+            return self.file_mtimes() != self.mtimes
+        except FileNotFoundError:
+            return True
+
+
+class ReportService:
+    """Keeps the current ReportData warm and reloads it when the files change."""
+
+    def __init__(self, year_file: Path = TASK_F_DIR / "2025.csv", week_dir: Path = TASK_E_DIR):
+        self.year_file = year_file
+        self.week_dir = week_dir
+        self.data = ReportData(year_file, week_dir)
+        self.reloads = 0
+        self._stop = threading.Event()
+
+    def watch(self, interval: float = RELOAD_INTERVAL) -> None:
+        """Checks the files every interval seconds and reloads changed data."""
+        while not self._stop.wait(interval):
+            if self.data.is_stale(self.week_dir):
+                try:
+                    self.data = ReportData(self.year_file, self.week_dir)
+                    self.reloads += 1
+                except (OSError, ValueError, IndexError) as e:
+                    print(f"Reload failed, keeping the previous data: {e}", file=sys.stderr)
+
+    def stop(self) -> None:
+        """Stops the watcher thread."""
+        self._stop.set()
+
+    def report(self, name: str, params: dict[str, str]) -> list[str]:
+        """
+        Returns the lines of the named report.
+
+        Raises ReportNotFound for an unknown report or week, KeyError for a
+        missing parameter and ValueError for a bad one.
+        """
+        data = self.data
+        if name == "yearly":
+            return data.yearly
+        if name == "monthly":
+            month = int(params["month"])
+            if month not in data.monthly:
+                raise ValueError("month must be 1-12")
+            return data.monthly[month]
+        if name == "daily":
+            return daily_report(data.daily, parse_fi_date(params["start"]), parse_fi_date(params["end"]))
+        if name == "weekly":
+            if "week" in params:
+                week_no = int(params["week"])
+                if week_no not in data.weekly:
+                    raise ReportNotFound(f"week {week_no}")
+                return data.weekly[week_no]
+            return [line for week_no in sorted(data.weekly) for line in data.weekly[week_no]]
+        raise ReportNotFound(f"report {name}")
+
+
+class ReportNotFound(KeyError):
+    """An unknown report or week (404); other KeyErrors are missing parameters (400)."""
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    """Serves the reports of the server's ReportService."""
+
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in one buffered write, without Nagle delays
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        name = url.path.strip("/")
+        service: ReportService = self.server.service
+
+        if name == "health":
+            self.send_body(200, {"status": "ok", "reloads": service.reloads}, "json")
+            return
+
+        fmt = params.get("format", "json")
+        try:
+            lines = service.report(name, params)
+        except ReportNotFound as e:
+            self.send_body(404, {"error": f"Unknown {e.args[0]}"}, "json")
+            return
+        except KeyError as e:
+            self.send_body(400, {"error": f"Missing parameter: {e.args[0]}"}, "json")
+            return
+        except ValueError as e:
+            self.send_body(400, {"error": str(e)}, "json")
+            return
+
+        if fmt == "text":
+            self.send_body(200, "\n".join(lines) + "\n", "text")
+        else:
+            self.send_body(200, {"report": name, "lines": lines}, "json")
+
+    def send_body(self, status: int, body, fmt: str) -> None:
+        """Sends a JSON or text response with a Content-Length header."""
+        if fmt == "json":
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        else:
+            payload = body.encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keeps the console quiet; the load test would otherwise flood it."""
+
+
+def create_server(port: int = DEFAULT_PORT, service: ReportService | None = None) -> ThreadingHTTPServer:
+    """Creates the HTTP server with a warm ReportService and starts the file watcher."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReportHandler)
+    server.daemon_threads = True
+    server.service = service or ReportService()
+    threading.Thread(target=server.service.watch, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    """Main function: starts the report server on the default port."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+
+    start = time.perf_counter()
+    server = create_server(port)
+    print(f"Data loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"Serving reports on http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Rollup tiers for long meter histories.
+
+The hourly rows are rolled up once into daily, weekly (ISO weeks, as in
+TaskE) and monthly totals. A query over a time range is answered from the
+coarsest tier that covers whole periods of the range. Raw hours are only
+read at the edges of the range where it starts or ends in the middle of a day.
+
+Every total is a list: consumption, production, temperature sum, hours.
+"""
+
+import operator
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import reduce
+
+from fast_csv import read_columns
+from task_f import format_comma, format_fi_date
+from timestamps import DEFAULT_TIMEZONE, daily_totals_from_columns, decode_timestamps, resolve_timezone
+
+TIERS = ["month", "week", "day", "hour"]
+
+
+def add_totals(total: list[float], values: list[float]) -> None:
+    """Adds the values to the total in place."""
+    for i, value in enumerate(values):
+        total[i] += value
+
+
+def next_month(d: date) -> date:
+    """Returns the first day of the month after the given date."""
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def plan_days(first: date, end: date) -> list[tuple]:
+    """Covers the days first <= d < end with whole ISO weeks and single days."""
+    parts: list[tuple] = []
+    d = first
+    while d < end:
+        if d.weekday() == 0 and d + timedelta(days=7) <= end:
+            year, week, _ = d.isocalendar()
+            parts.append(("week", (year, week)))
+            d += timedelta(days=7)
+        else:
+            parts.append(("day", d))
+            d += timedelta(days=1)
+    return parts
+
+
+class Rollups:
+    """Materialized daily, weekly and monthly totals over hourly meter data."""
+
+    def __init__(self, epoch_hours: array, columns: list[array], tz: str | tzinfo = DEFAULT_TIMEZONE):
+        self.tz = resolve_timezone(tz)
+
+        if any(map(operator.gt, epoch_hours, epoch_hours[1:])):
+            order = sorted(range(len(epoch_hours)), key=epoch_hours.__getitem__)
+            epoch_hours = array("q", [epoch_hours[i] for i in order])
+            columns = [array("d", [column[i] for i in order]) for column in columns]
+
+        self.epoch_hours = epoch_hours
+        self.columns = columns
+
+        self.days = daily_totals_from_columns(epoch_hours, columns, self.tz)
+        self.weeks: dict[tuple[int, int], list[float]] = {}
+        self.months: dict[tuple[int, int], list[float]] = {}
+
+        for d in sorted(self.days):
+            year, week, _ = d.isocalendar()
+            add_totals(self.weeks.setdefault((year, week), [0.0] * len(self.days[d])), self.days[d])
+            add_totals(self.months.setdefault((d.year, d.month), [0.0] * len(self.days[d])), self.days[d])
+
+    @classmethod
+    def from_file(cls, filename: str, tz: str | tzinfo = DEFAULT_TIMEZONE) -> "Rollups":
+        """Builds the rollups from a meter CSV file."""
+        _, times, values = read_columns(filename)
+        return cls(decode_timestamps(times), values[0:3], tz)
+
+    def epoch_hour(self, local: datetime) -> int:
+        """Returns the first epoch-hour at or after a local date and time."""
+        aware = local.replace(tzinfo=self.tz) if local.tzinfo is None else local
+        minutes = (aware - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(minutes=1)
+        return -(-minutes // 60)
+
+    def hour_totals(self, first: int, last: int) -> list[float]:
+        """Sums the raw hours with first <= epoch-hour < last."""
+        start = bisect_left(self.epoch_hours, first)
+        end = bisect_left(self.epoch_hours, last, start)
+        sums = [reduce(operator.add, column[start:end], 0.0) for column in self.columns]
+        sums.append(float(end - start))
+        return sums
+
+    def plan(self, start: datetime, end: datetime) -> list[tuple]:
+        """
+        Plans the query of the local time range start <= t < end.
+
+        Returns the parts of the range in order: ("hour", first, last) for raw
+        hours and ("day"/"week"/"month", key) for rollup entries. Aware bounds
+        are converted to the rollups' time zone first, as the tiers are its days.
+        """
+        if start.tzinfo is not None:
+            start = start.astimezone(self.tz).replace(tzinfo=None)
+        if end.tzinfo is not None:
+            end = end.astimezone(self.tz).replace(tzinfo=None)
+        if end <= start:
+            return []
+
+        first_day = start.date() if start.time() == datetime.min.time() else start.date() + timedelta(days=1)
+        end_day = end.date()
+
+        if first_day >= end_day:
+            return [("hour", self.epoch_hour(start), self.epoch_hour(end))]
+
+        parts: list[tuple] = []
+        if start < datetime.combine(first_day, datetime.min.time(), start.tzinfo):
+            parts.append(("hour", self.epoch_hour(start), self.epoch_hour(
+                datetime.combine(first_day, datetime.min.time(), start.tzinfo))))
+
+        # whole months in the middle, weeks and days in the gaps around them
+        month_start = first_day if first_day.day == 1 else next_month(first_day)
+        month_end = month_start
+        while next_month(month_end) <= end_day:
+            month_end = next_month(month_end)
+
+        if month_start < month_end:
+            parts.extend(plan_days(first_day, month_start))
+            d = month_start
+            while d < month_end:
+                parts.append(("month", (d.year, d.month)))
+                d = next_month(d)
+            parts.extend(plan_days(month_end, end_day))
+        else:
+            parts.extend(plan_days(first_day, end_day))
+
+        end_midnight = datetime.combine(end_day, datetime.min.time(), end.tzinfo)
+        if end > end_midnight:
+            parts.append(("hour", self.epoch_hour(end_midnight), self.epoch_hour(end)))
+        return parts
+
+    def query(self, start: datetime, end: datetime) -> list[float]:
+        """Returns the totals of the time range start <= t < end (local unless aware)."""
+        tiers = {"day": self.days, "week": self.weeks, "month": self.months}
+        total = [0.0] * (len(self.columns) + 1)
+
+        for part in self.plan(start, end):
+            if part[0] == "hour":
+                add_totals(total, self.hour_totals(part[1], part[2]))
+            else:
+                values = tiers[part[0]].get(part[1])
+                if values is not None:
+                    add_totals(total, values)
+        return total
+
+
+def scan_hours(rollups: Rollups, start: datetime, end: datetime) -> list[float]:
+    """Sums the range hour by hour from the raw data (reference for query)."""
+    return rollups.hour_totals(rollups.epoch_hour(start), rollups.epoch_hour(end))
+
+
+def main() -> None:
+    """Main function: builds the rollups for 2025.csv and compares a query with the raw hours."""
+    rollups = Rollups.from_file("2025.csv")
+
+    start = datetime(2025, 1, 15, 6, 0)
+    end = datetime(2025, 11, 20, 18, 0)
+
+    plan = rollups.plan(start, end)
+    counts = {tier: sum(1 for part in plan if part[0] == tier) for tier in TIERS}
+    raw_hours = sum(len(range(part[1], part[2])) for part in plan if part[0] == "hour")
+
+    begin = time.perf_counter()
+    for _ in range(100):
+        total = rollups.query(start, end)
+    query_time = (time.perf_counter() - begin) / 100
+
+    begin = time.perf_counter()
+    for _ in range(100):
+        reference = scan_hours(rollups, start, end)
+    scan_time = (time.perf_counter() - begin) / 100
+
+    print(f"Range {format_fi_date(start.date())} {start:%H.%M} - {format_fi_date(end.date())} {end:%H.%M}")
+    print("Plan: " + ", ".join(f"{counts[tier]} {tier}s" for tier in TIERS[0:3])
+          + f", {raw_hours} raw hours at the edges")
+    print(f"- Total consumption: {format_comma(total[0])} kWh (raw hours: {format_comma(reference[0])} kWh)")
+    print(f"- Total production: {format_comma(total[1])} kWh (raw hours: {format_comma(reference[1])} kWh)")
+    print(f"- Hours: {int(total[3])} (raw hours: {int(reference[3])})")
+    print(f"Query {query_time * 1e6:.0f} µs, raw hour scan {scan_time * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
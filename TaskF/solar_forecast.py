@@ -0,0 +1,194 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Solar production forecast baseline from seasonal profiles.
+
+Every site has a profile of its mean production per UTC hour of day and day
+of year (366 x 24 cells, float32 in one array, plus the number of days seen
+per day of year). UTC hours keep the sun at the same place in the profile
+over the daylight saving changes. A new day updates one row of the profile
+in place, so the profile never has to be rebuilt from the history.
+
+The forecast for a day is the mean of the profile over a window of days
+around it, weighted by how many days each row has seen. The smoothed rows
+are cached per day of year until an update touches the window.
+
+Usage: python -m tasks taskf solar [sites] [first forecast day dd.mm.yyyy]
+
+The forecasts start by default from the day after the data.
+"""
+
+import operator
+import sys
+import time
+from array import array
+from datetime import date, timedelta
+from itertools import repeat
+
+from fast_csv import read_columns
+from task_f import parse_fi_date
+from timestamps import EPOCH_ORDINAL, decode_timestamps
+
+HOURS = 24
+DAYS_OF_YEAR = 366
+# Days on each side of the forecast day that the forecast averages over
+WINDOW = 3
+
+
+def day_slot(d: date) -> int:
+    """Row of a date in the profile: day of year in a leap year, so 1 March is the same row every year."""
+    return date(2000, d.month, d.day).toordinal() - date(2000, 1, 1).toordinal()
+
+
+def utc_days(epoch_hours: array, values: array) -> list[tuple[date, array]]:
+    """Groups hourly values into complete UTC days: (date, 24 values) in time order."""
+    days: dict[int, array] = {}
+    for epoch_hour, value in zip(epoch_hours, values):
+        day = days.setdefault(epoch_hour // HOURS, array("d", bytes(8 * HOURS)))
+        day[epoch_hour % HOURS] = value
+    counts: dict[int, int] = {}
+    for epoch_hour in epoch_hours:
+        counts[epoch_hour // HOURS] = counts.get(epoch_hour // HOURS, 0) + 1
+    return [(date.fromordinal(EPOCH_ORDINAL + day), days[day])
+            for day in sorted(days) if counts[day] == HOURS]
+
+
+class SolarProfile:
+    """Seasonal hour-of-day x day-of-year production profile of one site."""
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.means = array("f", bytes(4 * DAYS_OF_YEAR * HOURS))
+        self.counts = array("H", bytes(2 * DAYS_OF_YEAR))
+        self._smoothed: dict[int, array] = {}
+
+    @classmethod
+    def from_history(cls, days: list[tuple[date, array]], window: int = WINDOW) -> "SolarProfile":
+        """Builds a profile from (date, 24 hourly values) pairs."""
+        profile = cls(window)
+        for d, values in days:
+            profile.add_day(d, values)
+        return profile
+
+    def scaled(self, factor: float) -> "SolarProfile":
+        """Returns a copy with every mean multiplied by factor (e.g. another site's panel size)."""
+        profile = SolarProfile(self.window)
+        profile.means = array("f", map(operator.mul, self.means, repeat(factor)))
+        profile.counts = array("H", self.counts)
+        return profile
+
+    def add_day(self, d: date, values: array) -> None:
+        """Adds one day of 24 hourly values (UTC hours) to the running means."""
+        if len(values) != HOURS:
+            raise ValueError(f"expected {HOURS} hourly values")
+        slot = day_slot(d)
+        count = self.counts[slot] + 1
+        self.counts[slot] = count
+        start = slot * HOURS
+        old = self.means[start:start + HOURS]
+        # mean += (value - mean) / count
+        self.means[start:start + HOURS] = array("f", map(
+            operator.add, old, map(operator.truediv, map(operator.sub, values, old), repeat(count))))
+        for near in range(slot - self.window, slot + self.window + 1):
+            self._smoothed.pop(near % DAYS_OF_YEAR, None)
+
+    def smoothed(self, slot: int) -> array:
+        """Weighted mean of the rows within the window around a day of year, cached."""
+        cached = self._smoothed.get(slot)
+        if cached is not None:
+            return cached
+
+        total = array("d", bytes(8 * HOURS))
+        weight = 0
+        for near in range(slot - self.window, slot + self.window + 1):
+            near %= DAYS_OF_YEAR
+            count = self.counts[near]
+            if count:
+                row = self.means[near * HOURS:(near + 1) * HOURS]
+                total = array("d", map(operator.add, total, map(operator.mul, row, repeat(count))))
+                weight += count
+        if weight:
+            total = array("d", map(operator.truediv, total, repeat(weight)))
+        self._smoothed[slot] = total
+        return total
+
+    def forecast(self, first: date, days: int = 1) -> list[tuple[date, array]]:
+        """Hourly forecasts (UTC hours) of the given number of days from the first day on."""
+        return [(first + timedelta(days=i), self.smoothed(day_slot(first + timedelta(days=i))))
+                for i in range(days)]
+
+
+def forecast_sites(profiles: list[SolarProfile], first: date, days: int) -> list[array]:
+    """Daily production forecasts of many sites: one array of daily totals per site."""
+    return [array("d", [sum(hours) for _, hours in profile.forecast(first, days)]) for profile in profiles]
+
+
+def backtest(days: list[tuple[date, array]], window: int = WINDOW) -> tuple[float, float, int]:
+    """
+    Walks the days in order, forecasting each day from the days before it.
+
+    Returns the mean absolute errors of the daily totals (kWh) of the profile
+    forecast and of the persistence forecast (yesterday again), and the number
+    of days compared.
+    """
+    profile = SolarProfile(window)
+    profile_error = persistence_error = 0.0
+    compared = 0
+    previous = None
+    for d, values in days:
+        actual = sum(values)
+        if previous is not None and profile.counts[day_slot(d - timedelta(days=1))]:
+            profile_error += abs(sum(profile.smoothed(day_slot(d))) - actual)
+            persistence_error += abs(sum(previous) - actual)
+            compared += 1
+        profile.add_day(d, values)
+        previous = values
+    return profile_error / compared, persistence_error / compared, compared
+
+
+def main() -> None:
+    """Main function: backtests the profile forecast and times forecasts for many sites."""
+    sites = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    header, times, columns = read_columns("2025.csv")
+    production = columns[header.index("Tuotanto (netotettu) kWh") - 1]
+    days = utc_days(decode_timestamps(times), production)
+
+    profile_mae, persistence_mae, compared = backtest(days)
+    print(f"Complete UTC days: {len(days)}, walk-forward next-day forecasts: {compared}")
+    print(f"Mean absolute error of the daily total: profile {profile_mae:.2f} kWh, "
+          f"persistence {persistence_mae:.2f} kWh")
+
+    start = time.perf_counter()
+    profile = SolarProfile.from_history(days)
+    build_time = time.perf_counter() - start
+    first = parse_fi_date(sys.argv[2]) if len(sys.argv) > 2 else days[-1][0] + timedelta(days=1)
+    print(f"Profile: {profile.means.itemsize * len(profile.means) + profile.counts.itemsize * len(profile.counts)} "
+          f"bytes, built in {build_time * 1000:.1f} ms")
+    print("Forecast:")
+    for d, hours in profile.forecast(first, 7):
+        peak = max(range(HOURS), key=hours.__getitem__)
+        print(f"- {d:%d.%m.%Y}: {sum(hours):.2f} kWh, peak {hours[peak]:.2f} kWh at {peak:02d} UTC")
+
+    fleet = [profile.scaled(0.5 + (i % 100) / 50) for i in range(sites)]
+    start = time.perf_counter()
+    next_day = forecast_sites(fleet, first, 1)
+    day_time = time.perf_counter() - start
+    for site in fleet:
+        site._smoothed.clear()
+    start = time.perf_counter()
+    next_week = forecast_sites(fleet, first, 7)
+    week_time = time.perf_counter() - start
+    start = time.perf_counter()
+    forecast_sites(fleet, first, 7)
+    cached_time = time.perf_counter() - start
+
+    print(f"\nSites: {sites}, profiles {sites * len(profile.means) * 4 / 2**20:.0f} MB")
+    print(f"Next-day forecasts:  {day_time:.2f} s")
+    print(f"Next-week forecasts: {week_time:.2f} s, again from the cache {cached_time:.2f} s")
+    print(f"Fleet next-day total {sum(map(sum, next_day)):.0f} kWh, next week {sum(map(sum, next_week)):.0f} kWh")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,18 @@
 import csv
 from datetime import datetime, date
 
+from tasks.templates import Column, Layout
+
+# Rows: (label, value, unit), e.g. "- Total consumption: 1234,56 kWh"
+SUMMARY_LAYOUT = Layout(
+    [
+        Column("label", gap="- ", suffix=":"),
+        Column("value", "number"),
+        Column("unit"),
+    ],
+    header=[],
+)
+
 def read_data(filename: str) -> list[list[str]]:
     """Reads a CSV file and returns the rows in a suitable structure."""
     rows = []
@@ -42,6 +54,14 @@ def format_comma(value: float) -> str:
     """Formats number with 2 decimals and comma as decimal separator."""
     return f"{value:.2f}".replace(".", ",")
 
+def summary_lines(cons_sum: float, prod_sum: float, avg_temp: float) -> list[str]:
+    """Returns the consumption, production and temperature lines of a report."""
+    return SUMMARY_LAYOUT.render_text([
+        ("Total consumption", cons_sum, "kWh"),
+        ("Total production", prod_sum, "kWh"),
+        ("Average temperature", avg_temp, "°C"),
+    ])
+
 def calculate_daily_totals(rows: list[list[str]]) -> dict[date, list[float]]:
     """Calculates daily totals for consumption, production, and temperature."""
     daily: dict[date, list[float]] = {}
@@ -68,9 +88,10 @@ def create_daily_report(daily: dict[date, list[float]]) -> list[str]:
     start_s = input("Enter start date (dd.mm.yyyy): ").strip()
     end_s = input("Enter end date (dd.mm.yyyy): ").strip()
 
-    start_d = parse_fi_date(start_s)
-    end_d = parse_fi_date(end_s)
+    return daily_report(daily, parse_fi_date(start_s), parse_fi_date(end_s))
 
+def daily_report(daily: dict[date, list[float]], start_d: date, end_d: date) -> list[str]:
+    """Creates a daily report for the given date range."""
     if end_d < start_d:
         start_d, end_d = end_d, start_d
 
@@ -91,15 +112,17 @@ def create_daily_report(daily: dict[date, list[float]]) -> list[str]:
     lines: list[str] = []
     lines.append("-" * 53)
     lines.append(f"Report for the period {format_fi_date(start_d)}-{format_fi_date(end_d)}")
-    lines.append(f"- Total consumption: {format_comma(cons_sum)} kWh")
-    lines.append(f"- Total production: {format_comma(prod_sum)} kWh")
-    lines.append(f"- Average temperature: {format_comma(avg_temp)} °C")
+    lines.extend(summary_lines(cons_sum, prod_sum, avg_temp))
     return lines
 
 def create_monthly_report(daily: dict[date, list[float]]) -> list[str]:
     """Creates a monthly summary report for a selected month."""
     month = int(input("Enter month number (1-12): ").strip())
 
+    return monthly_report(daily, month)
+
+def monthly_report(daily: dict[date, list[float]], month: int) -> list[str]:
+    """Creates a monthly summary report for the given month (1-12)."""
     cons_sum = 0.0
     prod_sum = 0.0
     daily_avg_temp_sum = 0.0
@@ -126,9 +149,7 @@ def create_monthly_report(daily: dict[date, list[float]]) -> list[str]:
     lines: list[str] = []
     lines.append("-" * 53)
     lines.append(f"Report for the month: {month_names[month - 1]}")
-    lines.append(f"- Total consumption: {format_comma(cons_sum)} kWh")
-    lines.append(f"- Total production: {format_comma(prod_sum)} kWh")
-    lines.append(f"- Average temperature: {format_comma(avg_temp)} °C")
+    lines.extend(summary_lines(cons_sum, prod_sum, avg_temp))
     return lines
 
 def create_yearly_report(daily: dict[date, list[float]]) -> list[str]:
@@ -149,9 +170,7 @@ def create_yearly_report(daily: dict[date, list[float]]) -> list[str]:
 
     lines: list[str] = []
     lines.append("Report for the year: 2025")
-    lines.append(f"- Total consumption: {format_comma(cons_sum)} kWh")
-    lines.append(f"- Total production: {format_comma(prod_sum)} kWh")
-    lines.append(f"- Average temperature: {format_comma(avg_temp)} °C")
+    lines.extend(summary_lines(cons_sum, prod_sum, avg_temp))
     return lines
 
 def print_report_to_console(lines: list[str]) -> None:
@@ -0,0 +1,245 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Fast timestamp decoding for the hourly meter data.
+
+Timestamps such as 2025-01-01T00:00:00.000+02:00 are decoded into integer
+epoch-hours (hours since 1970-01-01 00:00 UTC) for the whole column at once.
+Days are then grouped in a configurable time zone, so days around the
+daylight saving time changes get 23 or 25 hours as they should.
+"""
+
+import operator
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import reduce
+from zoneinfo import ZoneInfo
+
+from task_f import calculate_daily_totals, read_data
+
+DEFAULT_TIMEZONE = "Europe/Helsinki"
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class _DayCache(dict):
+    """Parsed dates: yyyy-mm-dd -> minutes since 1970-01-01."""
+
+    def __missing__(self, key: str) -> int:
+        d = date(int(key[0:4]), int(key[5:7]), int(key[8:10]))
+        minutes = self[key] = (d.toordinal() - EPOCH_ORDINAL) * 1440
+        return minutes
+
+
+class _TimeOfDayCache(dict):
+    """Parsed time-of-day parts: hh:mm:ss[.fff]+hh:mm -> minutes after midnight UTC."""
+
+    def __missing__(self, key: str) -> int:
+        clock = key[0:5]
+        offset = key[-6:]
+        if clock[2] != ":" or offset[0] not in "+-" or offset[3] != ":":
+            raise ValueError(f"Invalid time of day: {key!r}")
+        sign = -1 if offset[0] == "-" else 1
+        minutes = self[key] = (
+            int(clock[0:2]) * 60 + int(clock[3:5])
+            - sign * (int(offset[1:3]) * 60 + int(offset[4:6]))
+        )
+        return minutes
+
+
+# Only a few dozen distinct time-of-day parts (hours x UTC offsets) occur
+_DAYS = _DayCache()
+_TIMES_OF_DAY = _TimeOfDayCache()
+
+# First epoch-hour of each local date: (date, tzinfo) -> epoch-hour
+_MIDNIGHTS: dict[tuple[date, tzinfo], int] = {}
+
+_get_day = operator.itemgetter(slice(0, 10))
+_get_time_of_day = operator.itemgetter(slice(11, None))
+
+
+def _has_offset(s: str) -> bool:
+    """Checks that a timestamp has the yyyy-mm-ddThh:mm...+hh:mm form."""
+    return len(s) >= 22 and s[10] == "T" and s[-6] in "+-" and s[-3] == ":"
+
+
+def decode_epoch_hour(s: str) -> int:
+    """Decodes one ISO 8601 timestamp into epoch-hours (no offset = UTC)."""
+    s = s.strip()
+    if _has_offset(s):
+        return (_DAYS[s[0:10]] + _TIMES_OF_DAY[s[11:]]) // 60
+
+    dt = datetime.fromisoformat(s)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) // 3600
+
+
+def decode_timestamps(column: list[str] | tuple[str, ...]) -> array:
+    """
+    Decodes a column of timestamps into an array of epoch-hours.
+
+    When the timestamps share one fixed-width form with a UTC offset, the
+    date and time-of-day parts are sliced out and looked up from caches
+    column by column, so each distinct date and UTC offset is parsed only
+    once. Other columns are decoded timestamp by timestamp.
+    """
+    if column and _has_offset(column[0]) and len(set(map(len, column))) == 1:
+        minutes = map(
+            operator.add,
+            map(_DAYS.__getitem__, map(_get_day, column)),
+            map(_TIMES_OF_DAY.__getitem__, map(_get_time_of_day, column)),
+        )
+        try:
+            return array("q", map((60).__rfloordiv__, minutes))
+        except ValueError:
+            pass
+
+    return array("q", map(decode_epoch_hour, column))
+
+
+def resolve_timezone(tz: str | tzinfo) -> tzinfo:
+    """Returns a tzinfo object for a time zone name or tzinfo."""
+    return ZoneInfo(tz) if isinstance(tz, str) else tz
+
+
+def local_midnight_epoch_hour(d: date, tz: tzinfo) -> int:
+    """Returns the first epoch-hour that falls on the given local date, using a cache."""
+    key = (d, tz)
+    if key in _MIDNIGHTS:
+        return _MIDNIGHTS[key]
+    midnight = datetime(d.year, d.month, d.day, tzinfo=tz)
+    minutes = (midnight - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(minutes=1)
+    epoch_hour = _MIDNIGHTS[key] = -(-minutes // 60)
+    return epoch_hour
+
+
+def local_day_bounds(epoch_hours: array,
+                     tz: str | tzinfo = DEFAULT_TIMEZONE) -> list[tuple[date, int, int]]:
+    """
+    Splits sorted epoch-hours into local days of the given time zone.
+
+    Returns (date, start, end) tuples: the hours of the day are
+    epoch_hours[start:end]. Days without any hours are left out.
+    """
+    if not epoch_hours:
+        return []
+
+    tz = resolve_timezone(tz)
+    first = datetime.fromtimestamp(epoch_hours[0] * 3600, tz).date()
+    last = datetime.fromtimestamp(epoch_hours[-1] * 3600, tz).date()
+
+    bounds: list[tuple[date, int, int]] = []
+    start = 0
+    for ordinal in range(first.toordinal(), last.toordinal() + 1):
+        d = date.fromordinal(ordinal)
+        end = bisect_left(epoch_hours, local_midnight_epoch_hour(d + timedelta(days=1), tz), start)
+        if end > start:
+            bounds.append((d, start, end))
+        start = end
+    return bounds
+
+
+def parse_decimal_column(column: list[str] | tuple[str, ...]) -> array:
+    """Parses a column of decimal-comma numbers into floats."""
+    return array("d", map(float, ";".join(column).replace(",", ".").split(";")))
+
+
+def daily_totals_from_columns(epoch_hours: array, columns: list[array],
+                              tz: str | tzinfo = DEFAULT_TIMEZONE) -> dict[date, list[float]]:
+    """
+    Sums value columns per local day of the given time zone.
+
+    Returns one list per day: the column sums followed by the number of hours.
+    """
+    if any(map(operator.gt, epoch_hours, epoch_hours[1:])):
+        order = sorted(range(len(epoch_hours)), key=epoch_hours.__getitem__)
+        epoch_hours = array("q", [epoch_hours[i] for i in order])
+        columns = [array("d", [column[i] for i in order]) for column in columns]
+
+    # reduce keeps the summation order of the row-by-row reference
+    daily: dict[date, list[float]] = {}
+    for d, start, end in local_day_bounds(epoch_hours, tz):
+        sums = [reduce(operator.add, column[start:end], 0.0) for column in columns]
+        sums.append(float(end - start))
+        daily[d] = sums
+    return daily
+
+
+def calculate_daily_totals_tz(rows: list[list[str]],
+                              tz: str | tzinfo = DEFAULT_TIMEZONE) -> dict[date, list[float]]:
+    """
+    Calculates daily totals like calculate_daily_totals, grouping the days
+    in the given time zone by their epoch-hour ranges.
+    """
+    data = rows[1:]
+    if not data:
+        return {}
+    times, *values = list(zip(*data))[0:4]
+    columns = [parse_decimal_column(column) for column in values]
+    return daily_totals_from_columns(decode_timestamps(times), columns, tz)
+
+
+def calculate_daily_totals_astimezone(rows: list[list[str]],
+                                      tz: str | tzinfo = DEFAULT_TIMEZONE) -> dict[date, list[float]]:
+    """
+    Row-by-row version of calculate_daily_totals_tz: every timestamp is
+    converted with astimezone. Kept as the reference for the fast path.
+    """
+    tz = resolve_timezone(tz)
+    daily: dict[date, list[float]] = {}
+    for row in rows[1:]:
+        d = datetime.fromisoformat(row[0].strip()).astimezone(tz).date()
+
+        if d not in daily:
+            daily[d] = [0.0, 0.0, 0.0, 0.0]  # cons, prod, temp_sum, temp_count
+
+        daily[d][0] += float(row[1].strip().replace(",", "."))
+        daily[d][1] += float(row[2].strip().replace(",", "."))
+        daily[d][2] += float(row[3].strip().replace(",", "."))
+        daily[d][3] += 1.0
+
+    return daily
+
+
+def best_time(func, *args, repeat: int = 5) -> float:
+    """Returns the best wall-clock time of several calls in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Main function: compares the fast path with calculate_daily_totals."""
+    rows = read_data("2025.csv")
+    column = [row[0] for row in rows[1:]]
+
+    reference_decode = best_time(lambda: [datetime.fromisoformat(s.strip()).date() for s in column])
+    fast_decode = best_time(decode_timestamps, column)
+    offset_total = best_time(calculate_daily_totals, rows)
+    per_row_total = best_time(calculate_daily_totals_astimezone, rows)
+    fast_total = best_time(calculate_daily_totals_tz, rows)
+
+    fast = calculate_daily_totals_tz(rows)
+
+    print(f"Rows: {len(column)}, days: {len(fast)}")
+    print(f"Decode timestamps: fromisoformat + date {reference_decode * 1000:.1f} ms, "
+          f"epoch-hours {fast_decode * 1000:.1f} ms")
+    print(f"Daily totals, offset-local days:   {offset_total * 1000:.1f} ms")
+    print(f"Daily totals, {DEFAULT_TIMEZONE} days: row by row {per_row_total * 1000:.1f} ms, "
+          f"fast {fast_total * 1000:.1f} ms ({per_row_total / fast_total:.1f}x)")
+    print(f"Same result as calculate_daily_totals: {fast == calculate_daily_totals(rows)}")
+    print(f"Same result as row by row: {fast == calculate_daily_totals_astimezone(rows)}")
+
+    for d in (date(2025, 3, 30), date(2025, 10, 26)):
+        print(f"- {d.strftime('%d.%m.%Y')}: {int(fast[d][3])} hours")
+
+
+if __name__ == "__main__":
+    main()
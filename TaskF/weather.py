@@ -0,0 +1,229 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Heating degree days and temperature-normalized consumption.
+
+The daily totals of calculate_daily_totals are turned into columns of daily
+consumption and mean temperature. The temperature enters the regression as
+heating degree days, max(0, 17 °C - t), since above the base temperature
+nothing is heated and consumption no longer follows the weather. For every
+site the fit
+
+consumption = base load + heating need * HDD
+
+is kept as running sums (n, Σx, Σy, Σxx, Σxy, Σyy) in arrays with one
+element per site. A new day updates the sums of all sites with a few
+C-level map calls, so the fits never have to be recomputed from the history.
+
+The heating need (kWh per degree day) compares sites independently of
+their local weather, and consumption normalized to common reference degree
+days compares their totals.
+"""
+
+import operator
+import random
+import statistics
+import sys
+import time
+from array import array
+from datetime import date
+from itertools import repeat
+
+from task_f import calculate_daily_totals, format_comma, read_data
+
+# Heating degree days are counted below this daily mean temperature (°C), as in Finland
+BASE_TEMPERATURE = 17.0
+
+SUMS = ["n", "sx", "sy", "sxx", "sxy", "syy"]
+
+
+def daily_columns(daily: dict[date, list[float]]) -> tuple[list[date], array, array]:
+    """Returns the days in order with their consumption and mean temperature columns."""
+    days = sorted(daily)
+    totals = [daily[d] for d in days]
+    consumption = array("d", map(operator.itemgetter(0), totals))
+    temperature = array("d", map(operator.truediv, map(operator.itemgetter(2), totals),
+                                 map(operator.itemgetter(3), totals)))
+    return days, consumption, temperature
+
+
+def heating_degree_days(temperatures: array, base: float = BASE_TEMPERATURE) -> array:
+    """Returns max(0, base - t) for every daily mean temperature."""
+    return array("d", map(max, repeat(0.0), map(operator.sub, repeat(base), temperatures)))
+
+
+def _zeros(count: int) -> array:
+    return array("d", bytes(8 * count))
+
+
+class SiteRegressions:
+    """Incremental least-squares fits of consumption against heating degree days for many sites."""
+
+    def __init__(self, sites: int):
+        self.sites = sites
+        for name in SUMS:
+            setattr(self, name, _zeros(sites))
+
+    def add_day(self, temperatures: array, consumptions: array) -> None:
+        """Adds one day of every site: temperatures[i] and consumptions[i] belong to site i."""
+        if len(temperatures) != self.sites or len(consumptions) != self.sites:
+            raise ValueError(f"expected {self.sites} values per column")
+        self.add_degree_day(heating_degree_days(temperatures), consumptions)
+
+    def add_degree_day(self, degree_days: array, consumptions: array) -> None:
+        """Adds one day of every site given as heating degree days."""
+        if len(degree_days) != self.sites or len(consumptions) != self.sites:
+            raise ValueError(f"expected {self.sites} values per column")
+        add = operator.add
+        mul = operator.mul
+        self.n = array("d", map(add, self.n, repeat(1.0)))
+        self.sx = array("d", map(add, self.sx, degree_days))
+        self.sy = array("d", map(add, self.sy, consumptions))
+        self.sxx = array("d", map(add, self.sxx, map(mul, degree_days, degree_days)))
+        self.sxy = array("d", map(add, self.sxy, map(mul, degree_days, consumptions)))
+        self.syy = array("d", map(add, self.syy, map(mul, consumptions, consumptions)))
+
+    def add_history(self, site: int, temperatures: array, consumptions: array) -> None:
+        """Adds many days of one site."""
+        degree_days = heating_degree_days(temperatures)
+        self.n[site] += len(degree_days)
+        self.sx[site] += sum(degree_days)
+        self.sy[site] += sum(consumptions)
+        self.sxx[site] += sum(map(operator.mul, degree_days, degree_days))
+        self.sxy[site] += sum(map(operator.mul, degree_days, consumptions))
+        self.syy[site] += sum(map(operator.mul, consumptions, consumptions))
+
+    def fit(self) -> tuple[array, array, array]:
+        """
+        Returns the heating needs (kWh per degree day), base loads (kWh per day)
+        and r² of all sites.
+
+        A site with fewer than two days or constant degree days gets slope 0,
+        its mean consumption as the intercept and r² 0.
+        """
+        slopes = _zeros(self.sites)
+        intercepts = _zeros(self.sites)
+        r_squared = _zeros(self.sites)
+        for i, (n, sx, sy, sxx, sxy, syy) in enumerate(zip(*(getattr(self, name) for name in SUMS))):
+            if n == 0:
+                continue
+            # Centered sums: variance and covariance times n
+            vxx = sxx - sx * sx / n
+            vxy = sxy - sx * sy / n
+            vyy = syy - sy * sy / n
+            if n < 2 or vxx <= 0:
+                intercepts[i] = sy / n
+                continue
+            slopes[i] = vxy / vxx
+            intercepts[i] = (sy - slopes[i] * sx) / n
+            r_squared[i] = vxy * vxy / (vxx * vyy) if vyy > 0 else 0.0
+        return slopes, intercepts, r_squared
+
+
+def normalized(consumptions: array, degree_days: array, heating_needs: array,
+               reference_degree_days: array) -> array:
+    """
+    Consumption as if the degree days had been the reference ones, element by element:
+    consumption + heating need * (reference - actual). Works for days or for totals per site.
+    """
+    return array("d", map(operator.add, consumptions,
+                          map(operator.mul, heating_needs,
+                              map(operator.sub, reference_degree_days, degree_days))))
+
+
+def monthly_report(days: list[date], consumption: array, temperature: array,
+                   base_load: float, heating_need: float) -> list[str]:
+    """Monthly consumption and degree days, and the consumption split into base load and heating."""
+    hdd = heating_degree_days(temperature)
+    months: dict[int, list[float]] = {}
+    for d, cons, degree_days in zip(days, consumption, hdd):
+        total = months.setdefault(d.month, [0.0, 0.0, 0])
+        total[0] += cons
+        total[1] += degree_days
+        total[2] += 1
+
+    lines = [f"{'Month':<7}{'Consumption kWh':>17}{'HDD °Cd':>10}{'Base load kWh':>16}{'Heating kWh':>14}"]
+    for month, (cons, degree_days, day_count) in sorted(months.items()):
+        lines.append(f"{month:<7}{format_comma(cons):>17}{format_comma(degree_days):>10}"
+                     f"{format_comma(base_load * day_count):>16}{format_comma(heating_need * degree_days):>14}")
+    return lines
+
+
+def synthetic_fleet(temperature: array, base_load: float, heating_need: float, sites: int,
+                    seed: int = 1) -> tuple[list[array], list[array]]:
+    """
+    Sites in warmer and colder places with their own base load and heating need
+    (around the given ones, with daily noise), as one column over the sites per day.
+    """
+    rng = random.Random(seed)
+    offsets = [rng.uniform(-4.0, 4.0) for _ in range(sites)]
+    bases = [base_load * rng.uniform(0.3, 3.0) for _ in range(sites)]
+    needs = [heating_need * rng.uniform(0.3, 3.0) for _ in range(sites)]
+    temperature_days = []
+    consumption_days = []
+    for t in temperature:
+        temperatures = array("d", [t + offset for offset in offsets])
+        degree_days = heating_degree_days(temperatures)
+        temperature_days.append(temperatures)
+        consumption_days.append(array("d", [(b + k * hdd) * rng.uniform(0.9, 1.1)
+                                            for b, k, hdd in zip(bases, needs, degree_days)]))
+    return temperature_days, consumption_days
+
+
+def main() -> None:
+    """Main function: fits the TaskF site and benchmarks incremental fleet fits."""
+    sites = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    daily = calculate_daily_totals(read_data("2025.csv"))
+    days, consumption, temperature = daily_columns(daily)
+    hdd = heating_degree_days(temperature)
+
+    model = SiteRegressions(1)
+    model.add_history(0, temperature, consumption)
+    needs, bases, r_squared = model.fit()
+    reference = statistics.linear_regression(hdd, consumption)
+
+    print(f"Days: {len(days)}, heating degree days: {format_comma(sum(hdd))} °Cd (base {BASE_TEMPERATURE:g} °C)")
+    print(f"Consumption = {bases[0]:.3f} kWh/day + {needs[0]:.3f} kWh/°Cd * HDD, r² {r_squared[0]:.3f}")
+    print(f"statistics.linear_regression: {reference.intercept:.3f} + {reference.slope:.3f} * HDD")
+    for line in monthly_report(days, consumption, temperature, bases[0], needs[0]):
+        print(line)
+
+    temperature_days, consumption_days = synthetic_fleet(temperature, bases[0], needs[0], sites)
+    fleet = SiteRegressions(sites)
+    start = time.perf_counter()
+    for t, c in zip(temperature_days, consumption_days):
+        fleet.add_day(t, c)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fleet_needs, _, _ = fleet.fit()
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    refit = []
+    for i in range(sites):
+        site_hdd = heating_degree_days(array("d", [t[i] for t in temperature_days]))
+        refit.append(statistics.linear_regression(site_hdd, [c[i] for c in consumption_days]).slope)
+    refit_time = time.perf_counter() - start
+    error = max(abs(a - b) for a, b in zip(fleet_needs, refit))
+
+    # Yearly consumption of every site as if all had had the fleet's mean degree days
+    site_hdd = array("d", fleet.sx)
+    yearly = array("d", fleet.sy)
+    common = array("d", repeat(sum(site_hdd) / sites, sites))
+    comparable = normalized(yearly, site_hdd, fleet_needs, common)
+    colder = max(range(sites), key=site_hdd.__getitem__)
+
+    print(f"\nSites: {sites}, days: {len(days)}")
+    print(f"Incremental sums, one new day for all sites: {add_time / len(days) * 1000:.2f} ms")
+    print(f"Fit of all sites from the sums:              {fit_time * 1000:.1f} ms")
+    print(f"Refit of all sites from the history:         {refit_time * 1000:.1f} ms")
+    print(f"Largest heating need difference to the refit: {error:.2e}")
+    print(f"Coldest site: {format_comma(site_hdd[colder])} °Cd, {format_comma(yearly[colder])} kWh, "
+          f"normalized to the fleet's {format_comma(common[0])} °Cd: {format_comma(comparable[colder])} kWh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Thread-safe booking engine on top of TaskG's Reservation class.
+
+Bookings can be created, confirmed and cancelled from many threads (or from
+asyncio tasks, as no lock is held across an await). Every resource has its
+own lock, its bookings in start time order and its own counters, so
+operations on different resources never wait for each other. A new booking
+is rejected with BookingConflict when it overlaps a booking of the same
+resource, and with ValueError when its id is in use or its duration is
+not positive.
+
+The engine-wide figures are the sums of the per-resource counters, read
+while holding all resource locks, so they always describe one consistent
+moment. An optional journal function (e.g. appending to a file) is called
+for every change while the resource is still locked, so each resource's
+changes are journaled in the order they happened.
+
+Usage: python -m tasks taskg booking [threads] [operations per thread] [journal write ms]
+"""
+
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, datetime, time as time_of_day, timedelta
+from typing import Callable
+
+from task_g_class import Reservation, fetch_reservations
+
+
+class BookingConflict(Exception):
+    """Raised when a booking overlaps an existing booking of the same resource."""
+
+    def __init__(self, reservation: Reservation, existing: Reservation):
+        super().__init__(
+            f"{reservation.resource} is already booked {existing.date} {existing.time:%H:%M} "
+            f"for {existing.duration} h (reservation {existing.reservation_id})")
+        self.reservation = reservation
+        self.existing = existing
+
+
+def booking_minutes(reservation: Reservation) -> tuple[int, int]:
+    """Start and end of a reservation in minutes from 0001-01-01 (end exclusive)."""
+    start = reservation.date.toordinal() * 1440 + reservation.time.hour * 60 + reservation.time.minute
+    return start, start + reservation.duration * 60
+
+
+def price_cents(reservation: Reservation) -> int:
+    """Total price of a reservation in cents."""
+    return round(reservation.price * 100) * reservation.duration
+
+
+class ResourceSchedule:
+    """Bookings and counters of one resource. All access goes through the lock."""
+
+    def __init__(self, lock: threading.Lock):
+        self.lock = lock
+        # (start, end, reservation_id) sorted by start; the intervals never overlap
+        self.intervals: list[tuple[int, int, int]] = []
+        self.bookings: dict[int, Reservation] = {}
+        self.confirmed = 0
+        self.revenue_cents = 0
+
+    def find_conflict(self, start: int, end: int) -> Reservation | None:
+        """Returns a booking overlapping [start, end), None when the time is free."""
+        i = bisect_left(self.intervals, (start,))
+        # As the intervals do not overlap, only the neighbours can overlap the new one
+        if i > 0 and self.intervals[i - 1][1] > start:
+            return self.bookings[self.intervals[i - 1][2]]
+        if i < len(self.intervals) and self.intervals[i][0] < end:
+            return self.bookings[self.intervals[i][2]]
+        return None
+
+    def add(self, reservation: Reservation) -> None:
+        """Adds a reservation, the lock must be held."""
+        start, end = booking_minutes(reservation)
+        existing = self.find_conflict(start, end)
+        if existing is not None:
+            raise BookingConflict(reservation, existing)
+        self.intervals.insert(bisect_left(self.intervals, (start,)), (start, end, reservation.reservation_id))
+        self.bookings[reservation.reservation_id] = reservation
+        if reservation.confirmed:
+            self.confirmed += 1
+            self.revenue_cents += price_cents(reservation)
+
+    def remove(self, reservation: Reservation) -> None:
+        """Removes a reservation, the lock must be held."""
+        start, _ = booking_minutes(reservation)
+        i = bisect_left(self.intervals, (start,))
+        del self.intervals[i]
+        del self.bookings[reservation.reservation_id]
+        if reservation.confirmed:
+            self.confirmed -= 1
+            self.revenue_cents -= price_cents(reservation)
+
+
+class BookingEngine:
+    """
+    Accepts create, confirm and cancel operations concurrently.
+
+    With lock_per_resource=False all resources share one lock, which is the
+    baseline the contention benchmark compares against.
+    """
+
+    def __init__(self, reservations: list[Reservation] | None = None, lock_per_resource: bool = True,
+                 journal: Callable[[str, Reservation], None] | None = None):
+        self.lock_per_resource = lock_per_resource
+        self.journal = None
+        self._global_lock = threading.Lock()
+        # Guards only the creation of new resources
+        self._resources_lock = threading.Lock()
+        self._resources: dict[str, ResourceSchedule] = {}
+        # reservation_id -> resource; single dict operations are atomic
+        self._resource_of: dict[int, str] = {}
+        # Guards taking ids: the checks for duplicates and the next id for create
+        self._ids_lock = threading.Lock()
+        self._next_id = 1
+        for reservation in reservations or []:
+            self.add(reservation)
+        # The loaded reservations are not journaled
+        self.journal = journal
+
+    def _schedule(self, resource: str) -> ResourceSchedule:
+        """Returns the schedule of a resource, creating it on first use."""
+        schedule = self._resources.get(resource)
+        if schedule is None:
+            with self._resources_lock:
+                schedule = self._resources.get(resource)
+                if schedule is None:
+                    lock = threading.Lock() if self.lock_per_resource else self._global_lock
+                    schedule = self._resources[resource] = ResourceSchedule(lock)
+        return schedule
+
+    def _claim_id(self, reservation_id: int, resource: str) -> None:
+        """Reserves an id for a resource, keeping the ids of create ahead of it."""
+        with self._ids_lock:
+            if reservation_id in self._resource_of:
+                raise ValueError(f"Reservation {reservation_id} already exists")
+            self._resource_of[reservation_id] = resource
+            if reservation_id >= self._next_id:
+                self._next_id = reservation_id + 1
+
+    def _new_id(self) -> int:
+        """Returns the next unused id for create."""
+        with self._ids_lock:
+            reservation_id = self._next_id
+            self._next_id += 1
+        return reservation_id
+
+    def add(self, reservation: Reservation) -> Reservation:
+        """
+        Adds an existing Reservation, raising BookingConflict when the time is
+        taken and ValueError when its id is already in use or its duration is
+        not positive.
+        """
+        if reservation.duration <= 0:
+            # A booking must cover a non-empty interval, find_conflict and remove rely on it
+            raise ValueError("duration must be positive")
+        self._claim_id(reservation.reservation_id, reservation.resource)
+        schedule = self._schedule(reservation.resource)
+        with schedule.lock:
+            try:
+                schedule.add(reservation)
+            except BookingConflict:
+                del self._resource_of[reservation.reservation_id]
+                raise
+            if self.journal is not None:
+                self.journal("create", reservation)
+        return reservation
+
+    def create(self, name: str, email: str, phone: str, day: date, start: time_of_day,
+               duration: int, price: float, resource: str, confirmed: bool = False) -> Reservation:
+        """Books a resource and returns the new reservation."""
+        reservation = Reservation(self._new_id(), name, email, phone, day, start, duration,
+                                  price, confirmed, resource, datetime.now().replace(microsecond=0))
+        return self.add(reservation)
+
+    def _locked_booking(self, reservation_id: int) -> tuple[ResourceSchedule, Reservation]:
+        """Locks the resource of a reservation and returns it with the reservation."""
+        resource = self._resource_of.get(reservation_id)
+        if resource is None:
+            raise KeyError(f"No reservation {reservation_id}")
+        schedule = self._resources[resource]
+        schedule.lock.acquire()
+        reservation = schedule.bookings.get(reservation_id)
+        if reservation is None:
+            # Cancelled by another thread in the meantime
+            schedule.lock.release()
+            raise KeyError(f"No reservation {reservation_id}")
+        return schedule, reservation
+
+    def confirm(self, reservation_id: int) -> Reservation:
+        """Confirms a reservation; confirming twice changes nothing."""
+        schedule, reservation = self._locked_booking(reservation_id)
+        try:
+            if not reservation.confirmed:
+                reservation.confirmed = True
+                schedule.confirmed += 1
+                schedule.revenue_cents += price_cents(reservation)
+                if self.journal is not None:
+                    self.journal("confirm", reservation)
+        finally:
+            schedule.lock.release()
+        return reservation
+
+    def cancel(self, reservation_id: int) -> Reservation:
+        """Cancels a reservation and frees its time."""
+        schedule, reservation = self._locked_booking(reservation_id)
+        try:
+            schedule.remove(reservation)
+            self._resource_of.pop(reservation_id, None)
+            if self.journal is not None:
+                self.journal("cancel", reservation)
+        finally:
+            schedule.lock.release()
+        return reservation
+
+    def get(self, reservation_id: int) -> Reservation:
+        """Returns a reservation by id."""
+        schedule, reservation = self._locked_booking(reservation_id)
+        schedule.lock.release()
+        return reservation
+
+    def _all_locks(self) -> tuple[list[ResourceSchedule], list]:
+        """
+        The current schedules and their distinct locks in resource name order,
+        so the locks are always taken in the same order. Only these schedules
+        are read under the locks; a resource created later is not part of the
+        snapshot.
+        """
+        with self._resources_lock:
+            schedules = [self._resources[name] for name in sorted(self._resources)]
+        locks = []
+        for schedule in schedules:
+            if not any(schedule.lock is lock for lock in locks):
+                locks.append(schedule.lock)
+        return schedules, locks
+
+    def totals(self) -> dict[str, int]:
+        """Returns the reservation count, confirmed count and confirmed revenue (cents) at one moment."""
+        schedules, locks = self._all_locks()
+        for lock in locks:
+            lock.acquire()
+        try:
+            return {
+                "reservations": sum(len(s.bookings) for s in schedules),
+                "confirmed": sum(s.confirmed for s in schedules),
+                "revenue_cents": sum(s.revenue_cents for s in schedules),
+            }
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def reservations(self) -> list[Reservation]:
+        """Returns all current reservations ordered by id."""
+        schedules, locks = self._all_locks()
+        for lock in locks:
+            lock.acquire()
+        try:
+            found = [r for s in schedules for r in s.bookings.values()]
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        return sorted(found, key=lambda r: r.reservation_id)
+
+
+def check_consistency(engine: BookingEngine) -> bool:
+    """Recomputes the totals from the reservations and checks that no bookings overlap."""
+    reservations = engine.reservations()
+    confirmed = [r for r in reservations if r.confirmed]
+    expected = {
+        "reservations": len(reservations),
+        "confirmed": len(confirmed),
+        "revenue_cents": sum(price_cents(r) for r in confirmed),
+    }
+    by_resource: dict[str, list[tuple[int, int]]] = {}
+    for r in reservations:
+        by_resource.setdefault(r.resource, []).append(booking_minutes(r))
+    for intervals in by_resource.values():
+        intervals.sort()
+        if any(a[1] > b[0] for a, b in zip(intervals, intervals[1:])):
+            return False
+    return engine.totals() == expected
+
+
+def worker(engine: BookingEngine, resources: list[str], operations: int, seed: int, results: list) -> None:
+    """Creates, confirms and cancels random bookings; appends (done, conflicts) to results."""
+    rng = random.Random(seed)
+    done = conflicts = 0
+    mine: list[int] = []
+    while done < operations:
+        action = rng.random()
+        if action < 0.6 or not mine:
+            try:
+                reservation = engine.create(
+                    "Benchmark", "bench@example.fi", "0400000000",
+                    date(2026, 1, 1) + timedelta(days=rng.randrange(365)),
+                    time_of_day(rng.randrange(8, 20)), rng.randint(1, 3), 20.0,
+                    rng.choice(resources))
+                mine.append(reservation.reservation_id)
+            except BookingConflict:
+                conflicts += 1
+        elif action < 0.85:
+            engine.confirm(rng.choice(mine))
+        else:
+            engine.cancel(mine.pop(rng.randrange(len(mine))))
+        done += 1
+    results.append((done, conflicts))
+
+
+def run_contention(threads: int, operations: int, resource_count: int, lock_per_resource: bool,
+                   journal_seconds: float = 0.0) -> tuple[float, int]:
+    """
+    Runs the workers and returns operations per second and the number of conflicts.
+
+    With journal_seconds each change waits that long under the resource lock,
+    standing in for a journal write.
+    """
+    journal = (lambda operation, reservation: time.sleep(journal_seconds)) if journal_seconds else None
+    engine = BookingEngine(lock_per_resource=lock_per_resource, journal=journal)
+    resources = [f"Resource {i}" for i in range(resource_count)]
+    results: list = []
+    workers = [threading.Thread(target=worker, args=(engine, resources, operations, i, results))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if not check_consistency(engine):
+        raise RuntimeError("Booking engine counters are inconsistent")
+    return threads * operations / elapsed, sum(c for _, c in results)
+
+
+def main():
+    """
+    Loads the reservations and runs the contention benchmark
+    """
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    journal_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    engine = BookingEngine(fetch_reservations("reservations.txt"))
+    print(f"Loaded: {engine.totals()}, consistent: {check_consistency(engine)}")
+
+    # Switch often so that the threads really interleave inside the engine
+    sys.setswitchinterval(0.0001)
+    print(f"Threads: {threads}, operations per thread: {operations}")
+    print("In-memory only:")
+    for resource_count in (1, 4, 16, 64):
+        per_resource, conflicts = run_contention(threads, operations, resource_count, True)
+        single, _ = run_contention(threads, operations, resource_count, False)
+        print(f"{resource_count:3} resources: {per_resource / 1000:6.1f} k ops/s per-resource locks, "
+              f"{single / 1000:6.1f} k ops/s one global lock, {conflicts} conflicts")
+
+    # Fewer operations, as every change now waits for the journal
+    operations = max(1, operations // 40)
+    print(f"With a {journal_ms} ms journal write per change, {operations} operations per thread:")
+    for resource_count in (1, 2, 4, 8, 16):
+        per_resource, _ = run_contention(threads, operations, resource_count, True, journal_ms / 1000)
+        single, _ = run_contention(threads, operations, resource_count, False, journal_ms / 1000)
+        print(f"{resource_count:3} resources: {per_resource / 1000:6.1f} k ops/s per-resource locks, "
+              f"{single / 1000:6.1f} k ops/s one global lock")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,8 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 
 """
 
-from datetime import datetime
+from tasks.schema import get_converter
+from tasks.templates import Column, Layout
 
 class Reservation:
     def __init__(self, reservation_id, name, email, phone,
@@ -49,23 +50,38 @@ class Reservation:
         return self.duration * self.price
 
 
+# Fields are passed to Reservation positionally in the schema's HEADERS order
+_convert = get_converter("reservation", Reservation)
+
+CONFIRMED_LAYOUT = Layout(
+    [
+        Column("name", gap="- "),
+        Column("resource", gap=", "),
+        Column("date", "date", gap=", "),
+        Column("time", "time", gap=" at "),
+    ],
+    header=[],
+    access="attribute",
+)
+
+LONG_LAYOUT = Layout(
+    [
+        Column("name", gap="- "),
+        Column("date", "date", gap=", "),
+        Column("time", "time", gap=" at "),
+        Column("duration", gap=", duration ", suffix=" h"),
+        Column("resource", gap=", "),
+    ],
+    header=[],
+    access="attribute",
+)
+
+
 def convert_reservation_data(reservation: list[str]) -> Reservation:
     """
     Convert data types to meet program requirements
     """
-    return Reservation(
-        reservation_id=int(reservation[0]),  # reservationId (str -> int)
-        name=str(reservation[1]),  # name (str)
-        email=str(reservation[2]),  # email (str)
-        phone=str(reservation[3]),  # phone (str)
-        date=datetime.strptime(reservation[4], "%Y-%m-%d").date(),  # reservationDate (date)
-        time=datetime.strptime(reservation[5], "%H:%M").time(),  # reservationTime (time)
-        duration=int(reservation[6]),  # durationHours (int)
-        price=float(reservation[7]),  # price (float)
-        confirmed=True if reservation[8].strip() == 'True' else False,  # confirmed (bool)
-        resource=str(reservation[9]),  # reservedResource (str)
-        created=datetime.strptime(str(reservation[10]).strip(), "%Y-%m-%d %H:%M:%S")  # createdAt (datetime)
-    )
+    return _convert(reservation)
 
 
 def fetch_reservations(reservation_file: str) -> list[Reservation]:
@@ -86,27 +102,16 @@ def confirmed_reservations(reservations: list[Reservation]) -> None:
     """
     Print confirmed reservations
     """
-    for reservation in reservations:
-        if reservation.is_confirmed():
-            print(f'- {reservation.name}, '
-                  f'{reservation.resource}, '
-                  f'{reservation.date.strftime("%d.%m.%Y")} at'
-                  f' {reservation.time.strftime("%H.%M")}')
+    for line in CONFIRMED_LAYOUT.render_text(r for r in reservations if r.is_confirmed()):
+        print(line)
 
 
 def long_reservations(reservations: list[Reservation]) -> None:
     """
     Print long reservations
     """
-    for reservation in reservations:
-        if reservation.is_long():
-            print(
-                f'- {reservation.name}, '
-                f'{reservation.date.strftime("%d.%m.%Y")} at '
-                f'{reservation.time.strftime("%H.%M")}, '
-                f'duration {reservation.duration} h, '
-                f'{reservation.resource}'
-            )
+    for line in LONG_LAYOUT.render_text(r for r in reservations if r.is_long()):
+        print(line)
 
 
 def confirmation_statuses(reservations: list[Reservation]) -> None:
@@ -20,26 +20,40 @@ int | str | str | str | date | time | int | float | bool | str | datetime
 
 """
 
-from datetime import datetime
+from tasks.schema import get_converter
+from tasks.templates import Column, Layout
+
+_convert = get_converter("reservation", "dict")
+
+CONFIRMED_LAYOUT = Layout(
+    [
+        Column("name", gap="- "),
+        Column("reservedResource", gap=", "),
+        Column("reservationDate", "date", gap=", "),
+        Column("reservationTime", "time", gap=" at "),
+    ],
+    header=[],
+    access="key",
+)
+
+LONG_LAYOUT = Layout(
+    [
+        Column("name", gap="- "),
+        Column("reservationDate", "date", gap=", "),
+        Column("reservationTime", "time", gap=" at "),
+        Column("durationHours", gap=", duration ", suffix=" h"),
+        Column("reservedResource", gap=", "),
+    ],
+    header=[],
+    access="key",
+)
 
 
 def convert_reservation_data(reservation: list[str]) -> dict:
     """
     Convert data types to meet program requirements
     """
-    return {
-        "reservationId": int(reservation[0]),  # reservationId (str -> int)
-        "name": str(reservation[1]),  # name (str)
-        "email": str(reservation[2]),  # email (str)
-        "phone": str(reservation[3]),  # phone (str)
-        "reservationDate": datetime.strptime(reservation[4], "%Y-%m-%d").date(),  # reservationDate (date)
-        "reservationTime": datetime.strptime(reservation[5], "%H:%M").time(),  # reservationTime (time)
-        "durationHours": int(reservation[6]),  # durationHours (int)
-        "price": float(reservation[7]),  # price (float)
-        "confirmed": True if reservation[8].strip() == 'True' else False,  # confirmed (bool)
-        "reservedResource": str(reservation[9]),  # reservedResource (str)
-        "createdAt": datetime.strptime(str(reservation[10]).strip(), "%Y-%m-%d %H:%M:%S"),  # createdAt (datetime)
-    }
+    return _convert(reservation)
 
 
 def fetch_reservations(reservation_file: str) -> list[dict]:
@@ -60,13 +74,8 @@ def confirmed_reservations(reservations: list[dict]) -> None:
     """
     Print confirmed reservations
     """
-    for reservation in reservations:
-        if reservation["confirmed"]:
-            print(
-                f'- {reservation["name"]}, {reservation["reservedResource"]}, '
-                f'{reservation["reservationDate"].strftime("%d.%m.%Y")} at '
-                f'{reservation["reservationTime"].strftime("%H.%M")}'
-            )
+    for line in CONFIRMED_LAYOUT.render_text(r for r in reservations if r["confirmed"]):
+        print(line)
 
 
 def long_reservations(reservations : list[dict]) -> None:
@@ -76,14 +85,8 @@ def long_reservations(reservations : list[dict]) -> None:
     Parameters:
      reservations (list[dict]): Reservations
     """
-    for reservation in reservations:
-        if reservation["durationHours"] >= 3:
-            print(
-                f'- {reservation["name"]}, '
-                f'{reservation["reservationDate"].strftime("%d.%m.%Y")} at '
-                f'{reservation["reservationTime"].strftime("%H.%M")}, '
-                f'duration {reservation["durationHours"]} h, '
-                f'{reservation["reservedResource"]}')
+    for line in LONG_LAYOUT.render_text(r for r in reservations if r["durationHours"] >= 3):
+        print(line)
 
 
 def confirmation_statuses(reservations: list[dict]) -> None:
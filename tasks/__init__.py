@@ -0,0 +1,47 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Shared entry point for the Task programs.
+
+The Task programs share code from this package (tasks.schema,
+tasks.templates), so they are run through the dispatcher from the
+repository root, which finds the package and sets up the Task folders:
+
+python -m tasks taskf yearly
+python -m tasks taske summary
+
+The dispatcher is the supported entry point. A plain "python task_f.py"
+inside a Task folder does not find this package; start it with the root
+on the path instead: PYTHONPATH=.. python task_f.py
+
+Only the modules needed by the chosen subcommand are imported. Tools of
+this package that use a Task program's modules import them with
+import_task, the one place that puts Task folders on sys.path.
+"""
+
+import os
+import sys
+from importlib import import_module
+from types import ModuleType
+
+# os.path instead of pathlib keeps the dispatcher's own imports minimal
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TASK_DIRS = {
+    "taska": os.path.join(ROOT, "TaskA"),
+    "taskb": os.path.join(ROOT, "TaskB"),
+    "taskc": os.path.join(ROOT, "TaskC"),
+    "taskd": os.path.join(ROOT, "TaskD"),
+    "taske": os.path.join(ROOT, "TaskE"),
+    "taskf": os.path.join(ROOT, "TaskF"),
+    "taskg": os.path.join(ROOT, "TaskG"),
+}
+
+
+def import_task(task: str, module: str) -> ModuleType:
+    """Imports a module from a Task folder, putting the folder on the path for its own imports."""
+    path = TASK_DIRS[task]
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return import_module(module)
@@ -0,0 +1,8 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+import sys
+
+from tasks.cli import main
+
+sys.exit(main(sys.argv[1:]))
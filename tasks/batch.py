@@ -0,0 +1,363 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Sharded batch runner for the nightly TaskE and TaskF reports.
+
+Every meter file is one job: a TaskE weekly file (phase columns) gets its
+week_section summary, a TaskF hourly file its yearly report. The jobs are
+sharded by a CRC of the site name over N local worker processes, which
+stand in for nodes. Each shard is a work-stealing deque in shared memory:
+a worker takes its own jobs from the front and, when it runs out, steals
+from the back of the other shards, so one slow shard does not hold up the
+run.
+
+Finished jobs are appended to a checkpoint file (one JSON object per line)
+as they arrive. A run started again with the same checkpoint skips the
+jobs already in it, and jobs lost with a crashed worker are run again. The
+per-site totals are kept in integer Wh, so the merged fleet totals do not
+depend on the sharding or the order in which jobs finish.
+
+Usage:
+python -m tasks.batch run <output dir> <meter files...> [--workers N] [--checkpoint FILE]
+python -m tasks.batch bench [meters]
+"""
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+
+from tasks import TASK_DIRS, import_task
+
+# Totals kept per job kind, in this order
+TOTALS = {
+    "taske": ["cons1_wh", "cons2_wh", "cons3_wh", "prod1_wh", "prod2_wh", "prod3_wh"],
+    "taskf": ["consumption_wh", "production_wh", "hours"],
+}
+
+# How many times jobs lost with crashed workers are run again
+RETRIES = 2
+
+
+def site_of(path: str) -> str:
+    """Site name of a meter file: the file name without its extension."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def shard_of(site: str, shards: int) -> int:
+    """Shard of a site; CRC32 so that a site lands in the same shard in every process and run."""
+    return zlib.crc32(site.encode()) % shards
+
+
+def job_kind(path: str) -> str:
+    """TaskE weekly files have per-phase columns, TaskF files one consumption column."""
+    with open(path, "r", encoding="utf-8") as f:
+        header = f.readline()
+    return "taske" if "vaihe" in header else "taskf"
+
+
+def run_job(path: str, kind: str, output_dir: str) -> list[int]:
+    """Writes the report of one meter file and returns its totals (see TOTALS)."""
+    site = site_of(path)
+    if kind == "taske":
+        task_e = import_task("taske", "task_e")
+        daily = task_e.daily_totals_wh(task_e.read_data(path))
+        week_no = min(daily).isocalendar()[1] if daily else 0
+        task_e.write_report(os.path.join(output_dir, f"{site}.summary.txt"), task_e.week_section(week_no, daily))
+        return [sum(day[i] for day in daily.values()) for i in range(6)]
+
+    task_f = import_task("taskf", "task_f")
+    fixed_point = import_task("taskf", "fixed_point")
+    rows = task_f.read_data(path)
+    lines = task_f.create_yearly_report(task_f.calculate_daily_totals(rows))
+    with open(os.path.join(output_dir, f"{site}.report.txt"), "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+    # The totals come from the fixed-point path, so they are exact Wh
+    year = [v for d, v in fixed_point.calculate_daily_totals_fixed(rows).items() if d.year == 2025]
+    return [sum(v[0] for v in year), sum(v[1] for v in year), sum(v[3] for v in year)]
+
+
+class ShardDeques:
+    """
+    One deque of job numbers per shard in shared memory.
+
+    The jobs of shard s are order[starts[s]:ends[s]]; heads and tails move
+    inwards as jobs are taken from the front (owner) or the back (thieves).
+    """
+
+    def __init__(self, shard_jobs: list[list[int]]):
+        shards = len(shard_jobs)
+        self.order = mp.Array("i", [job for jobs in shard_jobs for job in jobs], lock=False)
+        self.heads = mp.Array("i", shards, lock=False)
+        self.tails = mp.Array("i", shards, lock=False)
+        self.locks = [mp.Lock() for _ in range(shards)]
+        position = 0
+        for shard, jobs in enumerate(shard_jobs):
+            self.heads[shard] = position
+            position += len(jobs)
+            self.tails[shard] = position
+
+    def take(self, shard: int, own: bool) -> int | None:
+        """Takes a job from the front of the shard (own=True) or steals one from its back."""
+        with self.locks[shard]:
+            if self.heads[shard] >= self.tails[shard]:
+                return None
+            if own:
+                self.heads[shard] += 1
+                return self.order[self.heads[shard] - 1]
+            self.tails[shard] -= 1
+            return self.order[self.tails[shard]]
+
+
+def worker(shard: int, shards: int, deques: ShardDeques, jobs: list[tuple[str, str]],
+           output_dir: str, results: mp.Queue, crash_after: int | None = None) -> None:
+    """Runs the shard's own jobs, then steals from the other shards until all are empty."""
+    done = stolen = 0
+    while True:
+        job = deques.take(shard, True)
+        if job is None:
+            for other in range(shard + 1, shard + shards):
+                job = deques.take(other % shards, False)
+                if job is not None:
+                    stolen += 1
+                    break
+        if job is None:
+            break
+        if crash_after is not None and done == crash_after:
+            # Simulated crash: the job taken above is lost with the worker
+            os._exit(1)
+        path, kind = jobs[job]
+        results.put(("done", job, run_job(path, kind, output_dir)))
+        done += 1
+    results.put(("exit", shard, {"done": done, "stolen": stolen}))
+
+
+def read_checkpoint(checkpoint: str | None) -> dict[str, dict]:
+    """Finished jobs of an earlier run by file path."""
+    finished: dict[str, dict] = {}
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint, "r", encoding="utf-8") as f:
+            for line in f:
+                # A line cut short by a crash is simply run again
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                finished[entry["path"]] = entry
+    return finished
+
+
+def open_checkpoint(checkpoint: str):
+    """Opens the checkpoint for appending, ending a line cut short by a crash first."""
+    checkpoint_file = open(checkpoint, "a", encoding="utf-8")
+    if checkpoint_file.tell():
+        with open(checkpoint, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            cut_short = f.read(1) != b"\n"
+        if cut_short:
+            # Otherwise the first new entry would be joined to it and skipped on the next resume
+            checkpoint_file.write("\n")
+    return checkpoint_file
+
+
+def run_round(jobs: list[tuple[str, str]], pending: list[int], workers: int, output_dir: str,
+              checkpoint_file, finished: dict, worker_stats: list, crash: dict | None = None) -> None:
+    """Runs the pending jobs once over the workers; lost jobs stay out of finished."""
+    shard_jobs: list[list[int]] = [[] for _ in range(workers)]
+    for job in pending:
+        shard_jobs[shard_of(site_of(jobs[job][0]), workers)].append(job)
+    deques = ShardDeques(shard_jobs)
+    results: mp.Queue = mp.Queue()
+    processes = [
+        mp.Process(target=worker, args=(shard, workers, deques, jobs, output_dir, results,
+                                        (crash or {}).get(shard)))
+        for shard in range(workers)
+    ]
+    for p in processes:
+        p.start()
+
+    exited = 0
+    while exited < workers:
+        try:
+            message = results.get(timeout=0.2)
+        except queue.Empty:
+            # Stop waiting when every worker has ended, also those that crashed
+            if all(not p.is_alive() for p in processes) and results.empty():
+                break
+            continue
+        if message[0] == "exit":
+            exited += 1
+            worker_stats.append(message[2])
+            continue
+        _, job, totals = message
+        path, kind = jobs[job]
+        entry = {"path": path, "site": site_of(path), "kind": kind, "totals": totals}
+        finished[path] = entry
+        if checkpoint_file is not None:
+            checkpoint_file.write(json.dumps(entry) + "\n")
+            checkpoint_file.flush()
+    for p in processes:
+        p.join()
+
+
+def run_batch(paths: list[str], output_dir: str, workers: int | None = None,
+              checkpoint: str | None = None, crash: dict | None = None) -> dict:
+    """
+    Runs the reports of all meter files and returns the merged fleet totals.
+    The site names of the files must be unique, as the reports are named by
+    site; a ValueError is raised before any job runs otherwise.
+
+    Parameters:
+     paths (list[str]): Meter files
+     output_dir (str): Directory of the report files
+     workers (int): Worker processes, default the number of CPUs
+     checkpoint (str): Checkpoint file; finished jobs in it are not run again
+     crash (dict): {shard: jobs} makes a worker exit after that many jobs (testing)
+
+    Returns:
+     summary (dict): fleet totals per kind, sites, jobs run now, rounds and worker stats
+    """
+    sites: dict[str, str] = {}
+    for path in paths:
+        site = site_of(path)
+        if site in sites:
+            raise ValueError(f"{sites[site]} and {path} have the same site name {site!r}")
+        sites[site] = path
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    finished = read_checkpoint(checkpoint)
+    jobs = [(path, job_kind(path)) for path in paths]
+    pending = [i for i, (path, _) in enumerate(jobs) if path not in finished]
+    ran = len(pending)
+    worker_stats: list = []
+    rounds = 0
+
+    checkpoint_file = open_checkpoint(checkpoint) if checkpoint else None
+    try:
+        for attempt in range(RETRIES + 1):
+            if not pending:
+                break
+            rounds += 1
+            run_round(jobs, pending, workers, output_dir, checkpoint_file, finished, worker_stats,
+                      crash if attempt == 0 else None)
+            pending = [i for i, (path, _) in enumerate(jobs) if path not in finished]
+    finally:
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+    if pending:
+        raise RuntimeError(f"{len(pending)} jobs failed: {[jobs[i][0] for i in pending[:5]]}")
+    return merge(finished[path] for path in paths) | {"ran": ran, "rounds": rounds, "workers": worker_stats}
+
+
+def merge(entries) -> dict:
+    """Adds the per-site totals of finished jobs into fleet totals per kind."""
+    fleet = {kind: [0] * len(names) for kind, names in TOTALS.items()}
+    sites = {kind: 0 for kind in TOTALS}
+    for entry in entries:
+        totals = fleet[entry["kind"]]
+        for i, value in enumerate(entry["totals"]):
+            totals[i] += value
+        sites[entry["kind"]] += 1
+    return {
+        "fleet": {kind: dict(zip(TOTALS[kind], totals)) for kind, totals in fleet.items()},
+        "sites": sites,
+    }
+
+
+def write_fleet(directory: str, meters: int) -> list[str]:
+    """Writes meter files derived from the TaskE weeks and TaskF year, scaled per site."""
+    with open(os.path.join(TASK_DIRS["taskf"], "2025.csv"), "r", encoding="utf-8") as f:
+        year = f.read().splitlines()
+    with open(os.path.join(TASK_DIRS["taske"], "week41.csv"), "r", encoding="utf-8") as f:
+        week = f.read().splitlines()
+
+    paths = []
+    for i in range(meters):
+        scale = 1 + i % 7
+        path = os.path.join(directory, f"site{i:05d}.csv")
+        if i % 2:
+            rows = [";".join([fields[0]] + [str(int(v) * scale) for v in fields[1:]])
+                    for fields in (line.split(";") for line in week[1:])]
+            text = "\n".join([week[0]] + rows) + "\n"
+        else:
+            # Every 50th site has ten years of the same data: the straggler for work stealing
+            repeat = 10 if i % 50 == 0 else 1
+            text = "\n".join([year[0]] + year[1:] * repeat) + "\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+def benchmark(meters: int) -> None:
+    """Runs the fleet with 1..CPU count workers, then a crash and a resume."""
+    directory = tempfile.mkdtemp(prefix="fleet")
+    try:
+        os.makedirs(os.path.join(directory, "in"))
+        paths = write_fleet(os.path.join(directory, "in"), meters)
+        print(f"Meters: {meters} ({sum(job_kind(p) == 'taske' for p in paths)} TaskE weeks, "
+              f"{sum(job_kind(p) == 'taskf' for p in paths)} TaskF years), CPUs: {os.cpu_count()}")
+
+        reference = None
+        counts = sorted({1, 2, os.cpu_count() or 1, max(4, os.cpu_count() or 1)})
+        for workers in counts:
+            start = time.perf_counter()
+            summary = run_batch(paths, os.path.join(directory, f"out{workers}"), workers)
+            elapsed = time.perf_counter() - start
+            stolen = sum(w["stolen"] for w in summary["workers"])
+            reference = reference or summary["fleet"]
+            print(f"{workers:2} workers: {elapsed:6.2f} s, {meters / elapsed:6.1f} meters/s, "
+                  f"{stolen} jobs stolen, same fleet totals: {summary['fleet'] == reference}")
+
+        checkpoint = os.path.join(directory, "checkpoint.jsonl")
+        out = os.path.join(directory, "resumed")
+        summary = run_batch(paths, out, 2, checkpoint, crash={0: 3})
+        print(f"Crashed worker: {summary['rounds']} rounds, same fleet totals: {summary['fleet'] == reference}")
+
+        # A run killed halfway: keep the first half of the checkpoint and start again
+        with open(checkpoint, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(checkpoint, "w", encoding="utf-8") as f:
+            f.writelines(lines[:len(lines) // 2])
+            f.write(lines[len(lines) // 2][:20])
+        summary = run_batch(paths, out, 2, checkpoint)
+        print(f"Resumed run: {summary['ran']} of {meters} jobs run again, "
+              f"same fleet totals: {summary['fleet'] == reference}")
+        print(f"Fleet totals: {json.dumps(reference)}")
+    finally:
+        shutil.rmtree(directory)
+
+
+def main() -> None:
+    """Main function: runs a batch or the benchmark."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ("run", "bench"):
+        print(__doc__.strip())
+        return
+    if args[0] == "bench":
+        benchmark(int(args[1]) if len(args) > 1 else 200)
+        return
+
+    workers = None
+    checkpoint = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    if "--checkpoint" in args:
+        i = args.index("--checkpoint")
+        checkpoint = args[i + 1]
+        del args[i:i + 2]
+    summary = run_batch(args[2:], args[1], workers, checkpoint)
+    print(json.dumps({key: summary[key] for key in ("fleet", "sites", "ran")}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Benchmark of the validating ingest against the unvalidated loader.
+
+Usage: python -m tasks.bench_ingest [rows]
+"""
+
+import io
+import sys
+
+from tasks import TASK_DIRS, import_task
+from tasks.ingest import ingest
+from tasks.schema import get_converter
+
+# One example of each kind of bad line
+BAD_LINES = [
+    "206|Too Few Fields|x@y.fi|0401234567|2025-11-12\n",
+    "207|Extra Field|x@y.fi|0401234567|2025-11-12|09:00|2|18.50|True|Room|2025-08-12 14:33:20|extra\n",
+    "2x8|Bad Int|x@y.fi|0401234567|2025-11-12|09:00|2|18.50|True|Room|2025-08-12 14:33:20\n",
+    "209|Bad Date|x@y.fi|0401234567|2025-02-30|09:00|2|18.50|True|Room|2025-01-12 14:33:20\n",
+    "210|Bad Email|not-an-email|0401234567|2025-11-12|09:00|2|18.50|True|Room|2025-08-12 14:33:20\n",
+    "211|Bad Phone|x@y.fi|call me|2025-11-12|09:00|2|18.50|True|Room|2025-08-12 14:33:20\n",
+    "212|Bad Flag|x@y.fi|0401234567|2025-11-12|09:00|2|18.50|Yes|Room|2025-08-12 14:33:20\n",
+    "213|Created Later|x@y.fi|0401234567|2025-11-12|09:00|2|18.50|True|Room|2025-12-12 14:33:20\n",
+]
+
+
+def unvalidated(lines: list[str]) -> list:
+    """Loads the lines like TaskG's fetch_reservations with the compiled converter."""
+    convert = get_converter("reservation", "list")
+    return [convert(line.split("|")) for line in lines if len(line) > 1]
+
+
+def main() -> None:
+    """Main function: times the loaders over clean and dirty synthetic files."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    best_time = import_task("taskf", "timestamps").best_time
+
+    with open(f"{TASK_DIRS['taskg']}/reservations.txt", "r", encoding="utf-8") as f:
+        good = [line if line.endswith("\n") else line + "\n" for line in f if len(line) > 1]
+    clean = [good[i % len(good)] for i in range(count)]
+    dirty = [BAD_LINES[i // 100 % len(BAD_LINES)] if i % 100 == 0 else line for i, line in enumerate(clean)]
+
+    plain_time = best_time(unvalidated, clean)
+    clean_time = best_time(lambda: list(ingest(clean, quarantine=io.StringIO())))
+    dirty_time = best_time(lambda: list(ingest(dirty, quarantine=io.StringIO())))
+
+    stats: dict = {}
+    quarantine = io.StringIO()
+    list(ingest(dirty, quarantine=quarantine, stats=stats))
+
+    print(f"Rows: {count}")
+    print(f"Unvalidated loader:      {count / plain_time / 1000:.0f} k rows/s")
+    print(f"Validated, clean file:   {count / clean_time / 1000:.0f} k rows/s "
+          f"({clean_time / plain_time:.1f}x the unvalidated time)")
+    print(f"Validated, 1 % bad rows: {count / dirty_time / 1000:.0f} k rows/s "
+          f"({dirty_time / plain_time:.1f}x), quarantined {stats['quarantined']}")
+    print("Quarantine sample:")
+    for line in quarantine.getvalue().splitlines()[0:len(BAD_LINES)]:
+        print(f"- {line[:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Benchmark of the compiled schema converters against the hand-written
+per-function conversions the Task programs used before.
+
+Usage: python -m tasks.bench_schema [rows]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from tasks import TASK_DIRS
+from tasks.schema import convert_strict, get_converter
+
+
+def legacy_list(reservation: list) -> list:
+    """TaskC's former convert_reservation_data."""
+    converted = []
+    converted.append(int(reservation[0]))
+    converted.append(reservation[1])
+    converted.append(reservation[2])
+    converted.append(reservation[3])
+    converted.append(datetime.strptime(reservation[4], "%Y-%m-%d").date())
+    converted.append(datetime.strptime(reservation[5], "%H:%M").time())
+    converted.append(int(reservation[6]))
+    converted.append(float(reservation[7]))
+    converted.append(reservation[8].strip() == "True")
+    converted.append(reservation[9])
+    converted.append(datetime.strptime(reservation[10].strip(), "%Y-%m-%d %H:%M:%S"))
+    return converted
+
+
+def legacy_dict(reservation: list[str]) -> dict:
+    """TaskG's former dict convert_reservation_data."""
+    return {
+        "reservationId": int(reservation[0]),
+        "name": str(reservation[1]),
+        "email": str(reservation[2]),
+        "phone": str(reservation[3]),
+        "reservationDate": datetime.strptime(reservation[4], "%Y-%m-%d").date(),
+        "reservationTime": datetime.strptime(reservation[5], "%H:%M").time(),
+        "durationHours": int(reservation[6]),
+        "price": float(reservation[7]),
+        "confirmed": True if reservation[8].strip() == 'True' else False,
+        "reservedResource": str(reservation[9]),
+        "createdAt": datetime.strptime(str(reservation[10]).strip(), "%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def timed(convert, rows: list[list[str]]) -> tuple[float, list]:
+    """Converts all rows and returns the elapsed seconds and the results."""
+    start = time.perf_counter()
+    converted = [convert(fields) for fields in rows]
+    return time.perf_counter() - start, converted
+
+
+def main() -> None:
+    """Main function: converts the TaskG reservations many times with each converter."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with open(f"{TASK_DIRS['taskg']}/reservations.txt", "r", encoding="utf-8") as f:
+        lines = [line for line in f if len(line) > 1]
+    rows = [lines[i % len(lines)].split("|") for i in range(count)]
+
+    results = [
+        ("legacy list (TaskC)", legacy_list, get_converter("reservation", "list")),
+        ("legacy dict (TaskG)", legacy_dict, get_converter("reservation", "dict")),
+    ]
+
+    strict_time, _ = timed(lambda fields: convert_strict(fields, "reservation"), rows)
+    print(f"Rows: {count}")
+    print(f"Field specs interpreted per row: {count / strict_time / 1000:.0f} k rows/s")
+    for name, legacy, compiled in results:
+        legacy_time, expected = timed(legacy, rows)
+        compiled_time, converted = timed(compiled, rows)
+        print(f"{name}: {count / legacy_time / 1000:.0f} k rows/s, compiled "
+              f"{count / compiled_time / 1000:.0f} k rows/s ({legacy_time / compiled_time:.1f}x), "
+              f"same result: {converted == expected}")
+
+
+if __name__ == "__main__":
+    main()
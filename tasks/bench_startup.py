@@ -0,0 +1,93 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Startup-time benchmark for the common subcommands.
+
+For each subcommand the script measures:
+- wall-clock time of a fresh interpreter, through the dispatcher and by
+  starting the Task program directly with the repository on PYTHONPATH
+  (the menu driven TaskF gets its answers from stdin)
+- import time reported by python -X importtime, and the slowest imports
+
+Usage: python -m tasks.bench_startup [runs]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from tasks import ROOT, TASK_DIRS
+
+# name, dispatcher arguments, (task folder, script, stdin) when started directly
+CASES = [
+    ("taskf yearly", ["taskf", "yearly"], ("taskf", "task_f.py", "3\n3\n")),
+    ("taskf monthly", ["taskf", "monthly", "3"], ("taskf", "task_f.py", "2\n3\n3\n")),
+    ("taske summary", ["taske", "summary"], ("taske", "task_e.py", "")),
+    ("taskc", ["taskc"], ("taskc", "task_c.py", "")),
+    ("taskg class", ["taskg", "class"], ("taskg", "task_g_class.py", "")),
+]
+
+# The Task programs import the tasks package, so direct runs need the repository on the path
+DIRECT_ENV = {**os.environ, "PYTHONPATH": ROOT}
+
+# modules that only some subcommands need
+HEAVY_MODULES = ["http.server", "zoneinfo", "json", "fractions", "threading"]
+
+
+def wall_clock(command: list[str], cwd: str, stdin: str, runs: int, env: dict | None = None) -> float:
+    """Returns the best wall-clock time of running the command in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, input=stdin, text=True, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def import_times(command: list[str], cwd: str) -> list[tuple[int, str]]:
+    """Runs the command with -X importtime and returns (cumulative µs, module) per import."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=cwd, text=True,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, check=True)
+    times: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append((int(cumulative), name[1:].rstrip()))
+    return times
+
+
+def main() -> None:
+    """Main function: prints the startup benchmark of every case."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    python = sys.executable
+
+    print(f"Best of {runs} runs\n")
+    print(f"{'Subcommand':<16}{'dispatcher':>12}{'direct':>10}{'imports':>10}   heavy modules loaded")
+    print("-" * 75)
+
+    slowest: dict[str, list[tuple[int, str]]] = {}
+    for name, args, (task, script, stdin) in CASES:
+        dispatcher = wall_clock([python, "-m", "tasks", *args], ROOT, stdin, runs)
+        direct = wall_clock([python, script], TASK_DIRS[task], stdin, runs, DIRECT_ENV)
+
+        times = import_times(["-m", "tasks", *args], ROOT)
+        top_level = [(us, module) for us, module in times if not module.startswith(" ")]
+        total = sum(us for us, _ in top_level)
+        heavy = [m for m in HEAVY_MODULES if any(module.strip() == m for _, module in times)]
+        slowest[name] = sorted(top_level, reverse=True)[0:3]
+
+        print(f"{name:<16}{dispatcher * 1000:>10.1f}ms{direct * 1000:>8.1f}ms"
+              f"{total / 1000:>8.1f}ms   {', '.join(heavy) or '-'}")
+
+    print("\nSlowest top-level imports (cumulative):")
+    for name, top in slowest.items():
+        print(f"- {name}: " + ", ".join(f"{module.strip()} {us / 1000:.1f} ms" for us, module in top))
+
+
+if __name__ == "__main__":
+    main()
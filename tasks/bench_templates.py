@@ -0,0 +1,117 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Benchmark of the compiled report layouts against the hand-written
+f-string rows the Task programs used before.
+
+Usage: python -m tasks.bench_templates [sites] [weeks]
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from tasks import TASK_DIRS, import_task
+from tasks.templates import WEEKDAYS, Layout
+
+task_c = import_task("taskc", "task_c")
+task_e = import_task("taske", "task_e")
+
+
+def legacy_week_rows(daily: dict) -> list[str]:
+    """TaskE's former week_section row loop."""
+    lines = []
+    for d in sorted(daily.keys()):
+        cons1 = task_e.format_comma(daily[d][0] / 1000.0)
+        cons2 = task_e.format_comma(daily[d][1] / 1000.0)
+        cons3 = task_e.format_comma(daily[d][2] / 1000.0)
+        prod1 = task_e.format_comma(daily[d][3] / 1000.0)
+        prod2 = task_e.format_comma(daily[d][4] / 1000.0)
+        prod3 = task_e.format_comma(daily[d][5] / 1000.0)
+
+        weekday = WEEKDAYS[d.weekday()]
+        date_str = d.strftime("%d.%m.%Y")
+
+        lines.append(
+            f"{weekday:<12} {date_str:<12} "
+            f"{cons1:>7} {cons2:>7} {cons3:>7}   "
+            f"{prod1:>7} {prod2:>7} {prod3:>7}"
+        )
+    return lines
+
+
+def layout_week_rows(daily: dict) -> list[str]:
+    """The same rows through WEEK_LAYOUT."""
+    return task_e.WEEK_LAYOUT.render_text(((d, *daily[d]) for d in sorted(daily.keys())), header=False)
+
+
+def legacy_long_rows(reservations: list[list]) -> list[str]:
+    """TaskC's former long_reservations row loop."""
+    lines = []
+    for reservation in reservations:
+        if reservation[6] >= 3:
+            date_str = reservation[4].strftime("%d.%m.%Y")
+            time_str = reservation[5].strftime("%H.%M")
+            lines.append(f"- {reservation[1]}, {date_str} at {time_str}, duration {reservation[6]} h, {reservation[9]}")
+    return lines
+
+
+def layout_long_rows(reservations: list[list]) -> list[str]:
+    """The same rows through TaskC's LONG_LAYOUT."""
+    return task_c.LONG_LAYOUT.render_text(r for r in reservations if r[6] >= 3)
+
+
+def timed(func, *args) -> tuple[float, object]:
+    """Best time of three calls and the result."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    """Main function: renders multi-site weekly tables and long reservation lists."""
+    sites = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    weeks = int(sys.argv[2]) if len(sys.argv) > 2 else 52
+
+    rng = random.Random(1)
+    first = date(2025, 1, 6)
+    site_weeks = [{first + timedelta(days=7 * w + i): [rng.uniform(0, 20000) for _ in range(6)] for i in range(7)}
+                  for _ in range(sites) for w in range(weeks)]
+    rows = len(site_weeks) * 7
+
+    legacy_time, expected = timed(lambda: [legacy_week_rows(daily) for daily in site_weeks])
+    layout_time, rendered = timed(lambda: [layout_week_rows(daily) for daily in site_weeks])
+    print(f"Weekly tables, {sites} sites x {weeks} weeks ({rows} rows):")
+    print(f"- f-strings per row: {rows / legacy_time / 1000:.0f} k rows/s")
+    print(f"- compiled layout:   {rows / layout_time / 1000:.0f} k rows/s "
+          f"({legacy_time / layout_time:.1f}x), same text: {rendered == expected}")
+
+    all_rows = [(d, *daily[d]) for daily in site_weeks for d in sorted(daily)]
+    csv_time, _ = timed(task_e.WEEK_LAYOUT.render_csv, all_rows)
+    json_time, _ = timed(task_e.WEEK_LAYOUT.render_json, all_rows)
+    print(f"- CSV {rows / csv_time / 1000:.0f} k rows/s, JSON {rows / json_time / 1000:.0f} k rows/s")
+
+    reservations = task_c.fetch_reservations(f"{TASK_DIRS['taskc']}/reservations.txt")
+    many = [reservations[i % len(reservations)] for i in range(100_000)]
+    legacy_time, expected = timed(legacy_long_rows, many)
+    layout_time, rendered = timed(layout_long_rows, many)
+    print(f"Long reservations, {len(expected)} of {len(many)} rows:")
+    print(f"- strftime per row: {len(expected) / legacy_time / 1000:.0f} k rows/s")
+    print(f"- compiled layout:  {len(expected) / layout_time / 1000:.0f} k rows/s "
+          f"({legacy_time / layout_time:.1f}x), same text: {rendered == expected}")
+
+    compile_time, _ = timed(Layout, list(task_e.WEEK_LAYOUT.columns), task_e.WEEK_LAYOUT.header)
+    print(f"Compiling a layout: {compile_time * 1000:.2f} ms")
+    print("Example CSV:")
+    print(task_e.WEEK_LAYOUT.render_csv(all_rows[:2]), end="")
+    print("Example JSON:")
+    print(task_e.WEEK_LAYOUT.render_json(all_rows[:1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Command line dispatcher for the Task programs.
+
+Usage: python -m tasks <task> [subcommand] [arguments]
+
+taska | taskb | taskc | taskd            print the task's report
+taske [summary | analytics]              write summary.txt / analytics.txt
+taskf [menu]                             interactive report menu
+taskf yearly [--write]                   full year report
+taskf monthly <month> [--write]          report for one month (1-12)
+taskf daily <start> <end> [--write]      report for dd.mm.yyyy - dd.mm.yyyy
+taskf serve [port]                       HTTP report server
+taskf loadtest [clients] [requests]      load test against an in-process server
+taskf timestamps | fast-csv | fixed-point | rollups | daily-arrays    benchmarks
+taskf weather [sites]                    degree-day model and fleet fit benchmark
+taskf solar [sites] [first day]          solar production forecast and fleet benchmark
+taskg [class | dict]                     print the reservation reports
+taskg booking [threads] [operations]     booking engine contention benchmark
+
+Each program runs in its own Task folder, like when started directly.
+The modules are imported only when their subcommand is chosen, so e.g.
+"taskf yearly" never loads the HTTP server or the time zone database.
+"""
+
+import os
+import sys
+
+from tasks import TASK_DIRS, import_task
+
+# (task, subcommand) -> (module, function); None = the task's default subcommand
+COMMANDS: dict[tuple[str, str | None], tuple[str, str]] = {
+    ("taska", None): ("task_a", "main"),
+    ("taskb", None): ("task_b", "main"),
+    ("taskc", None): ("task_c", "main"),
+    ("taskd", None): ("task_d", "main"),
+    ("taske", None): ("task_e", "main"),
+    ("taske", "summary"): ("task_e", "main"),
+    ("taske", "analytics"): ("analytics", "main"),
+    ("taskf", None): ("task_f", "main"),
+    ("taskf", "menu"): ("task_f", "main"),
+    ("taskf", "serve"): ("report_server", "main"),
+    ("taskf", "loadtest"): ("load_test", "main"),
+    ("taskf", "timestamps"): ("timestamps", "main"),
+    ("taskf", "fast-csv"): ("fast_csv", "main"),
+    ("taskf", "fixed-point"): ("fixed_point", "main"),
+    ("taskf", "rollups"): ("rollups", "main"),
+    ("taskf", "daily-arrays"): ("daily_arrays", "main"),
+    ("taskf", "weather"): ("weather", "main"),
+    ("taskf", "solar"): ("solar_forecast", "main"),
+    ("taskg", None): ("task_g_class", "main"),
+    ("taskg", "class"): ("task_g_class", "main"),
+    ("taskg", "dict"): ("task_g_dict", "main"),
+    ("taskg", "booking"): ("booking_engine", "main"),
+}
+
+# TaskF reports that run without the interactive menu
+TASKF_REPORTS = {"yearly": 0, "monthly": 1, "daily": 2}
+
+
+def enter(task: str) -> None:
+    """Makes the task's folder the working directory, as the programs use relative file names."""
+    os.chdir(TASK_DIRS[task])
+
+
+def run_taskf_report(name: str, args: list[str]) -> int:
+    """Prints (and with --write saves) one TaskF report without the menu."""
+    write = "--write" in args
+    args = [a for a in args if a != "--write"]
+    if len(args) != TASKF_REPORTS[name]:
+        print(f"taskf {name} takes {TASKF_REPORTS[name]} argument(s)", file=sys.stderr)
+        return 2
+
+    enter("taskf")
+    task_f = import_task("taskf", "task_f")
+    # Bad arguments are checked before the data is read
+    try:
+        if name == "monthly":
+            month = int(args[0])
+            if not 1 <= month <= 12:
+                raise ValueError(f"month must be 1-12, got {month}")
+        elif name == "daily":
+            start, end = task_f.parse_fi_date(args[0]), task_f.parse_fi_date(args[1])
+    except ValueError as e:
+        print(f"taskf {name}: {e}", file=sys.stderr)
+        return 2
+
+    daily = task_f.calculate_daily_totals(task_f.read_data("2025.csv"))
+    if name == "yearly":
+        lines = task_f.create_yearly_report(daily)
+    elif name == "monthly":
+        lines = task_f.monthly_report(daily, month)
+    else:
+        lines = task_f.daily_report(daily, start, end)
+
+    task_f.print_report_to_console(lines)
+    if write:
+        task_f.write_report_to_file(lines)
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    """Runs the subcommand given on the command line and returns the exit status."""
+    if not argv or argv[0] in ("-h", "--help") or argv[0] not in TASK_DIRS:
+        print(__doc__.strip())
+        return 0 if argv and argv[0] in ("-h", "--help") else 2
+
+    task = argv[0]
+    sub = argv[1] if len(argv) > 1 else None
+    args = argv[2:]
+
+    if task == "taskf" and sub in TASKF_REPORTS:
+        return run_taskf_report(sub, args)
+
+    if (task, sub) not in COMMANDS:
+        print(f"Unknown subcommand for {task}: {sub}", file=sys.stderr)
+        return 2
+
+    module, function = COMMANDS[(task, sub)]
+    enter(task)
+    sys.argv = [module + ".py", *args]
+    getattr(import_task(task, module), function)()
+    return 0
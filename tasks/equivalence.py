@@ -0,0 +1,526 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Differential equivalence checks of the fast paths against the original code.
+
+The simple implementations of calculate_daily_totals (TaskF), daily_totals
+(TaskE), fetch_reservations and total_revenue (TaskC) are frozen below as
+they were before any optimisation, and serve as reference oracles. Random
+meter and reservation files are generated with the edge cases that have
+bitten before: days around the daylight saving time changes, days with no
+rows, header-only files, decimal commas and integer cells, corrupt meter
+cells (empty, double sign, lone separator), reservation sets with no
+confirmed reservations, and malformed or non-canonical reservation rows
+(seconds in times, compact dates, UTC offsets, stray whitespace, blank
+lines, nan prices). Every fast path is run on the same
+files and passes only when both sides reject the input or both give equal
+results: floats compare exactly (nan equal to nan), and integer engines
+against the reference rounded to their unit.
+
+Both sides are timed on every file, so each speedup reported here comes
+with the check that the results were the same.
+
+Usage: python -m tasks.equivalence [cases] [seed] [results file]
+
+A failing case is printed with its case number; the same seed generates
+the same files again. With a results file, the run is appended to it as
+one JSON line. The exit status is 1 when any check failed.
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from tasks import import_task
+from tasks.external import format_cents, revenue_cents
+from tasks.ingest import fetch_valid_reservations
+from tasks.snapshot_diff import ReservationTotals, SnapshotDiff
+
+analytics = import_task("taske", "analytics")
+task_e = import_task("taske", "task_e")
+daily_arrays = import_task("taskf", "daily_arrays")
+fast_csv = import_task("taskf", "fast_csv")
+fixed_point = import_task("taskf", "fixed_point")
+rollups = import_task("taskf", "rollups")
+task_f = import_task("taskf", "task_f")
+timestamps = import_task("taskf", "timestamps")
+task_c = import_task("taskc", "task_c")
+task_g_class = import_task("taskg", "task_g_class")
+task_g_dict = import_task("taskg", "task_g_dict")
+
+HELSINKI = ZoneInfo("Europe/Helsinki")
+
+TASKF_HEADER = "Aika;Kulutus (netotettu) kWh;Tuotanto (netotettu) kWh;Vuorokauden keskilämpötila"
+TASKE_HEADER = ("Aika;Kulutus vaihe 1 Wh;Kulutus vaihe 2 Wh;Kulutus vaihe 3 Wh;"
+                "Tuotanto vaihe 1 Wh;Tuotanto vaihe 2 Wh;Tuotanto vaihe 3 Wh")
+
+
+# Reference oracles: the original implementations, do not optimise these
+
+def reference_calculate_daily_totals(rows: list[list[str]]) -> dict[date, list[float]]:
+    """Calculates daily totals for consumption, production, and temperature."""
+    daily: dict[date, list[float]] = {}
+    for row in rows[1:]:
+        dt = datetime.fromisoformat(row[0].strip())
+        d = dt.date()
+
+        cons = float(row[1].strip().replace(",", "."))
+        prod = float(row[2].strip().replace(",", "."))
+        temp = float(row[3].strip().replace(",", "."))
+
+        if d not in daily:
+            daily[d] = [0.0, 0.0, 0.0, 0.0]  # cons, prod, temp_sum, temp_count
+
+        daily[d][0] += cons
+        daily[d][1] += prod
+        daily[d][2] += temp
+        daily[d][3] += 1.0
+
+    return daily
+
+
+def reference_daily_totals(rows: list[list[str]]) -> dict:
+    """Returns daily totals."""
+    daily = {}
+
+    for row in rows[1:]:
+        dt = datetime.fromisoformat(row[0])
+        d = dt.date()
+
+        if d not in daily:
+            daily[d] = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]  # cons1-3, prod1-3 (Wh)
+
+        daily[d][0] += float(row[1])
+        daily[d][1] += float(row[2])
+        daily[d][2] += float(row[3])
+        daily[d][3] += float(row[4])
+        daily[d][4] += float(row[5])
+        daily[d][5] += float(row[6])
+
+    return daily
+
+
+def reference_convert_reservation_data(reservation: list) -> list:
+    """Convert data types to meet program requirements."""
+    converted = []
+
+    converted.append(int(reservation[0]))  # reservationId (str -> int)
+    converted.append(reservation[1])  # name (str)
+    converted.append(reservation[2])  # email (str)
+    converted.append(reservation[3])  # phone (str)
+    converted.append(datetime.strptime(reservation[4], "%Y-%m-%d").date())  # reservationDate (date)
+    converted.append(datetime.strptime(reservation[5], "%H:%M").time())  # reservationTime (time)
+    converted.append(int(reservation[6]))  # durationHours (int)
+    converted.append(float(reservation[7]))  # price (float)
+    converted.append(reservation[8].strip() == "True")  # confirmed (bool)
+    converted.append(reservation[9])  # reservedResource (str)
+    converted.append(datetime.strptime(reservation[10].strip(), "%Y-%m-%d %H:%M:%S"))  # createdAt (datetime)
+    return converted
+
+
+def reference_fetch_reservations(reservation_file: str) -> list:
+    """Reads reservations from a file and returns the reservations converted."""
+    reservations = []
+    with open(reservation_file, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split("|")
+            reservations.append(reference_convert_reservation_data(fields))
+    return reservations
+
+
+def reference_fetch_nonblank_reservations(reservation_file: str) -> list:
+    """TaskG's original fetch_reservations: like TaskC's, but blank lines are skipped."""
+    reservations = []
+    with open(reservation_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(line) > 1:
+                fields = line.split("|")
+                reservations.append(reference_convert_reservation_data(fields))
+    return reservations
+
+
+def reference_total_revenue(reservations: list[list]) -> None:
+    """Print total revenue."""
+    total = 0.0
+    for reservation in reservations:
+        if reservation[8]:
+            total += reservation[6] * reservation[7]
+
+    amount_str = f"{total:.2f}".replace(".", ",")
+    print(f"Total revenue from confirmed reservations: {amount_str} €")
+
+
+# Random input files
+
+def local_hours(first: date, days: int, tz=HELSINKI) -> list[datetime]:
+    """Every local hour of the days from first on, 23 or 25 of them on DST change days."""
+    start = datetime(first.year, first.month, first.day, tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(first + timedelta(days=days), datetime.min.time(), tz).astimezone(timezone.utc)
+    return [(start + timedelta(hours=h)).astimezone(tz) for h in range((end - start) // timedelta(hours=1))]
+
+
+def random_first_day(rng: random.Random) -> date:
+    """A random day of 2024-2026, often a few days before a daylight saving time change."""
+    year = rng.choice([2024, 2025, 2026])
+    if rng.random() < 0.5:
+        # The changes are on the last Sunday of March and October
+        month_end = date(year, rng.choice([3, 10]), 31)
+        change = month_end - timedelta(days=(month_end.weekday() + 1) % 7)
+        return change - timedelta(days=rng.randint(0, 3))
+    return date(year, 1, 1) + timedelta(days=rng.randint(0, 364))
+
+
+def decimal_comma(rng: random.Random, value: float, decimals: int) -> str:
+    """A meter cell: decimal comma, sometimes a bare integer."""
+    if rng.random() < 0.02:
+        return str(round(value))
+    return f"{value:.{decimals}f}".replace(".", ",")
+
+
+def drop_days(rng: random.Random, hours: list[datetime]) -> list[datetime]:
+    """Leaves out every hour of a few random days."""
+    days = sorted({h.date() for h in hours})
+    empty = set(rng.sample(days, rng.randint(0, len(days) // 4))) if len(days) > 2 else set()
+    return [h for h in hours if h.date() not in empty]
+
+
+# Corrupt meter cells: empty, double sign, lone sign or separator
+BAD_CELLS = ["", " ", "--1,5", "+-1,5", "-", ",", "1,2,3"]
+
+
+def write_meter_file(path: str, rng: random.Random) -> None:
+    """A TaskF hourly meter file with UTC offsets in the timestamps; a few files have a corrupt cell."""
+    lines = [TASKF_HEADER]
+    if rng.random() > 0.03:
+        hours = drop_days(rng, local_hours(random_first_day(rng), rng.choice([1, 2, 7, 31, 92, 366])))
+        temperature = rng.uniform(-20, 25)
+        for h in hours:
+            offset = h.strftime("%z")
+            temperature += rng.uniform(-1, 1)
+            production = rng.uniform(0, 4) if 6 <= h.hour <= 20 and rng.random() < 0.7 else 0.0
+            lines.append(
+                f"{h:%Y-%m-%dT%H:%M:%S}.000{offset[:3]}:{offset[3:]};"
+                f"{decimal_comma(rng, rng.uniform(0, 6), 3)};{decimal_comma(rng, production, 3)};"
+                f"{decimal_comma(rng, temperature, 1)}"
+            )
+    if len(lines) > 1 and rng.random() < 0.1:
+        i = rng.randrange(1, len(lines))
+        cells = lines[i].split(";")
+        cells[rng.randint(1, 3)] = rng.choice(BAD_CELLS)
+        lines[i] = ";".join(cells)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_week_file(path: str, rng: random.Random) -> None:
+    """A TaskE week file with naive local timestamps and whole Wh per phase."""
+    lines = [TASKE_HEADER]
+    if rng.random() > 0.03:
+        first = random_first_day(rng)
+        first -= timedelta(days=first.weekday())
+        for h in drop_days(rng, local_hours(first, 7)):
+            production = [rng.randint(0, 3000) if 6 <= h.hour <= 20 and rng.random() < 0.7 else 0 for _ in range(3)]
+            lines.append(f"{h:%Y-%m-%dT%H:%M:%S};" + ";".join(map(str, [rng.randint(0, 3000) for _ in range(3)] + production)))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+NAMES = ["Moomin Valley", "Snork Maiden", "Little My Storm", "Äijä Öhman", "Snufkin", "Hemulen", "Too-ticky"]
+RESOURCES = ["Forest Area 1", "Flower Room", "Red Room", "Sauna", "Meeting Room A"]
+
+
+DEFECTS = ["seconds in the time", "compact date", "T in createdAt", "UTC offset", "stray whitespace", "nan price"]
+
+
+def add_defect(fields: list[str], rng: random.Random) -> None:
+    """Makes a reservation row malformed or non-canonical in one of the DEFECTS ways."""
+    defect = rng.choice(DEFECTS)
+    if defect == "seconds in the time":
+        fields[5] += ":00"
+    elif defect == "compact date":
+        fields[4] = fields[4].replace("-", "")
+    elif defect == "T in createdAt":
+        fields[10] = fields[10].replace(" ", "T")
+    elif defect == "UTC offset":
+        fields[10] += rng.choice(["+02:00", "+0000", "Z"])
+    elif defect == "stray whitespace":
+        i = rng.randrange(len(fields))
+        fields[i] = rng.choice([" ", "\t"]) + fields[i] if rng.random() < 0.5 else fields[i] + " "
+    else:
+        fields[7] = rng.choice(["nan", "inf", "-inf"])
+
+
+def write_reservation_file(path: str, rng: random.Random) -> None:
+    """
+    A | separated reservation file with unique ids; sometimes nothing is
+    confirmed, and some files have a few malformed or non-canonical rows
+    (DEFECTS) or a blank line.
+    """
+    count = rng.choice([0, 1, 3, 20, 200, 2000])
+    confirmed_share = 0.0 if rng.random() < 0.2 else rng.random()
+    defects = rng.sample(range(count), min(count, rng.randint(1, 3))) if rng.random() < 0.3 else []
+    lines = []
+    for i in range(count):
+        name = rng.choice(NAMES)
+        start = datetime(2025, 1, 1, rng.randint(7, 20), rng.choice([0, 15, 30, 45])) + timedelta(days=rng.randint(0, 364))
+        created = start - timedelta(seconds=rng.randint(0, 90 * 86400))
+        fields = [
+            str(201 + i), name, f"{name.split()[0].lower()}@example.fi", f"04{rng.randint(0, 99999999):08d}",
+            f"{start:%Y-%m-%d}", f"{start:%H:%M}",
+            str(rng.randint(1, 8)), f"{rng.randint(100, 9999) / 100:.2f}",
+            str(rng.random() < confirmed_share), rng.choice(RESOURCES), f"{created:%Y-%m-%d %H:%M:%S}",
+        ]
+        if i in defects:
+            add_defect(fields, rng)
+        lines.append("|".join(fields))
+    if lines and rng.random() < 0.1:
+        lines.insert(rng.randint(0, len(lines)), "")
+    end = "\n" if lines and rng.random() < 0.8 else ""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + end)
+
+
+GENERATORS: dict[str, Callable[[str, random.Random], None]] = {
+    "meter": write_meter_file,
+    "week": write_week_file,
+    "reservations": write_reservation_file,
+}
+
+
+# Engines under test: (name, input kind, reference, engine), both functions of the file path
+
+def printed(func: Callable, *args) -> str:
+    """What a report function prints."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        func(*args)
+    return out.getvalue()
+
+
+def in_units(daily: dict, scales: list[int]) -> dict:
+    """Float daily totals rounded to the integer units of a fixed-point engine."""
+    return {d: [round(v * s) for v, s in zip(values, scales)] for d, values in daily.items()}
+
+
+def revenue_line(cents: int) -> str:
+    """The total_revenue line of a revenue in cents."""
+    return f"Total revenue from confirmed reservations: {format_cents(cents)}\n"
+
+
+def utc_range_totals(path: str, totals: Callable) -> list[int]:
+    """
+    Totals of a rollups function over a UTC range from 7 hours after the
+    first hour to 5 hours before the last, in thousandths (the meter unit),
+    as the tiers add in another order than the hours.
+    """
+    data = rollups.Rollups.from_file(path)
+    first, last = (data.epoch_hours[0], data.epoch_hours[-1]) if data.epoch_hours else (0, 0)
+    start = datetime.fromtimestamp((first + 7) * 3600, timezone.utc)
+    end = datetime.fromtimestamp((last - 5) * 3600, timezone.utc)
+    return [round(v * 1000) for v in totals(data, start, end)]
+
+
+def valid_rows(reservation_file: str) -> list:
+    """
+    The rows the validating ingest must keep: those the reference converts,
+    without blank lines (skipped) and non-finite prices (quarantined).
+    """
+    rows = []
+    with open(reservation_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(line) <= 1:
+                continue
+            try:
+                row = reference_convert_reservation_data(line.split("|"))
+            except ValueError:
+                continue
+            if math.isfinite(row[7]):
+                rows.append(row)
+    return rows
+
+
+def cents_revenue(reservations: list) -> str:
+    """
+    reference_total_revenue's line for the integer-cent engines, which
+    reject a confirmed nan or inf price where the float total would print it.
+    """
+    if not all(math.isfinite(r[7]) for r in reservations if r[8]):
+        raise ValueError("confirmed reservation with a non-finite price")
+    return printed(reference_total_revenue, reservations)
+
+
+def revenue_fields(reservation_file: str) -> list:
+    """The fields revenue_cents reads (duration, price, confirmed), converted like the reference."""
+    with open(reservation_file, "r", encoding="utf-8") as f:
+        return [[None] * 6 + [int(fields[6]), float(fields[7]), fields[8].strip() == "True"]
+                for fields in (line.split("|") for line in f if len(line) > 1)]
+
+
+def snapshot_revenue(path: str) -> str:
+    totals = ReservationTotals()
+    totals.apply(SnapshotDiff().diff_file(path))
+    return totals.summary()[2] + "\n"
+
+
+def line_revenue(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return revenue_line(sum(revenue_cents(line) for line in f if len(line) > 1))
+
+
+CHECKS: list[tuple[str, str, Callable, Callable]] = [
+    ("TaskF totals: fast_csv reader", "meter",
+     lambda p: reference_calculate_daily_totals(task_f.read_data(p)),
+     fast_csv.calculate_daily_totals_from_file),
+    ("TaskF totals: epoch-hour columns", "meter",
+     lambda p: reference_calculate_daily_totals(task_f.read_data(p)),
+     lambda p: timestamps.calculate_daily_totals_tz(task_f.read_data(p))),
+    ("TaskF totals: date-ordinal arrays", "meter",
+     lambda p: reference_calculate_daily_totals(task_f.read_data(p)),
+     lambda p: dict(daily_arrays.calculate_daily_totals_arrays(task_f.read_data(p)).items())),
+    ("TaskF totals: fixed point (Wh)", "meter",
+     lambda p: in_units(reference_calculate_daily_totals(task_f.read_data(p)), [1000, 1000, 1000, 1]),
+     lambda p: fixed_point.calculate_daily_totals_fixed(task_f.read_data(p))),
+    ("TaskF rollups: UTC range query", "meter",
+     lambda p: utc_range_totals(p, rollups.scan_hours), lambda p: utc_range_totals(p, rollups.Rollups.query)),
+    ("TaskE totals: integer Wh", "week",
+     lambda p: reference_daily_totals(task_e.read_data(p)),
+     lambda p: task_e.daily_totals_wh(task_e.read_data(p))),
+    ("TaskE totals: analytics pass", "week",
+     lambda p: reference_daily_totals(task_e.read_data(p)),
+     lambda p: {d: v[:6] for d, v in analytics.analyze_week(task_e.read_data(p))["daily"].items()}),
+    # TaskG and the line readers skip blank lines like the original TaskG did; TaskC rejects them
+    ("Reservations: TaskC compiled", "reservations",
+     reference_fetch_reservations, task_c.fetch_reservations),
+    ("Reservations: TaskG dict", "reservations",
+     reference_fetch_nonblank_reservations, lambda p: [list(r.values()) for r in task_g_dict.fetch_reservations(p)]),
+    ("Reservations: TaskG class", "reservations",
+     reference_fetch_nonblank_reservations,
+     lambda p: [list(vars(r).values()) for r in task_g_class.fetch_reservations(p)]),
+    # The ingest rejects a row by quarantining it, so the rows are compared one by one
+    ("Reservations: validating ingest", "reservations",
+     valid_rows, lambda p: fetch_valid_reservations(p)[0]),
+    ("Revenue: TaskC", "reservations",
+     lambda p: printed(reference_total_revenue, reference_fetch_reservations(p)),
+     lambda p: printed(task_c.total_revenue, task_c.fetch_reservations(p))),
+    ("Revenue: TaskG class", "reservations",
+     lambda p: printed(reference_total_revenue, reference_fetch_nonblank_reservations(p)),
+     lambda p: printed(task_g_class.total_revenue, task_g_class.fetch_reservations(p))),
+    ("Revenue: snapshot totals (cents)", "reservations",
+     lambda p: cents_revenue(reference_fetch_nonblank_reservations(p)), snapshot_revenue),
+    # revenue_cents reads only the three fields it needs, so only those can reject a line
+    ("Revenue: raw lines (cents)", "reservations",
+     lambda p: cents_revenue(revenue_fields(p)), line_revenue),
+]
+
+
+def same(expected, actual) -> bool:
+    """expected == actual, except that nan equals nan (both sides read the same nan cell)."""
+    if isinstance(expected, float) and isinstance(actual, float) and math.isnan(expected):
+        return math.isnan(actual)
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(expected) == len(actual) and all(map(same, expected, actual))
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(same(expected[k], actual[k]) for k in expected)
+    return expected == actual
+
+
+def short(result) -> str:
+    """repr of a result, cut to one readable line."""
+    text = repr(result)
+    return text if len(text) <= 150 else f"{text[:150]}... ({len(result)} items)" if hasattr(result, "__len__") else text[:150]
+
+
+def first_difference(expected, actual) -> str:
+    """A short description of where two results differ."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(expected.keys() | actual.keys()):
+            if not same(expected.get(key), actual.get(key)):
+                return f"{key}: expected {expected.get(key)}, got {actual.get(key)}"
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return f"expected {len(expected)} items, got {len(actual)}"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            if not same(e, a):
+                return f"item {i}: expected {e}, got {a}"
+    return f"expected {short(expected)}, got {short(actual)}"
+
+
+def timed(func: Callable, path: str) -> tuple[float, object]:
+    """Time of one call and its result; an exception is the result."""
+    start = time.perf_counter()
+    try:
+        result = func(path)
+    except Exception as e:  # a crash is a difference like any other
+        result = e
+    return time.perf_counter() - start, result
+
+
+def run(cases: int, seed: int) -> list[dict]:
+    """Runs every check on cases random files of its kind and returns one result per check."""
+    directory = tempfile.mkdtemp(prefix="equivalence")
+    results = [{"check": name, "cases": 0, "mismatches": 0, "reference_s": 0.0, "engine_s": 0.0, "failures": []}
+               for name, _, _, _ in CHECKS]
+    try:
+        for case in range(cases):
+            for kind, generate in GENERATORS.items():
+                path = os.path.join(directory, f"{kind}{case}.txt")
+                generate(path, random.Random(f"{seed}:{kind}:{case}"))
+                for result, (_, check_kind, reference, engine) in zip(results, CHECKS):
+                    if check_kind != kind:
+                        continue
+                    reference_time, expected = timed(reference, path)
+                    engine_time, actual = timed(engine, path)
+                    result["cases"] += 1
+                    result["reference_s"] += reference_time
+                    result["engine_s"] += engine_time
+                    if isinstance(expected, Exception) and isinstance(actual, Exception):
+                        continue  # both rejected the file
+                    if (isinstance(expected, Exception) or type(actual) is not type(expected)
+                            or not same(expected, actual)):
+                        result["mismatches"] += 1
+                        if len(result["failures"]) < 3:
+                            result["failures"].append(f"case {case}: {first_difference(expected, actual)}")
+    finally:
+        shutil.rmtree(directory)
+    for result in results:
+        result["speedup"] = round(result["reference_s"] / result["engine_s"], 2) if result["engine_s"] else None
+    return results
+
+
+def main() -> None:
+    """Main function: runs the checks, prints the results and optionally records them."""
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else random.randrange(10**6)
+    start = time.perf_counter()
+    results = run(cases, seed)
+
+    print(f"Seed {seed}, {cases} files of each kind, {time.perf_counter() - start:.1f} s")
+    print(f"{'Check':<34} {'Cases':>5} {'Failed':>6} {'Reference':>10} {'Engine':>9} {'Speedup':>8}")
+    for result in results:
+        speedup = f"{result['speedup']:.2f}x" if result["speedup"] else "-"
+        print(f"{result['check']:<34} {result['cases']:>5} {result['mismatches']:>6} "
+              f"{result['reference_s'] * 1000:>8.0f}ms {result['engine_s'] * 1000:>7.0f}ms {speedup:>8}")
+        for failure in result["failures"]:
+            print(f"  {failure}")
+
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": datetime.now().isoformat(timespec="seconds"), "seed": seed,
+                                "cases": cases, "results": results}, ensure_ascii=False) + "\n")
+    if any(result["mismatches"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Memory-bounded sort and group-by over reservation record streams.
+
+external_sort buffers lines until the memory limit is reached, writes each
+buffer as a sorted run to a temporary file and merges the runs with
+heapq.merge. external_group_by aggregates in a dict and, when the dict grows
+past the limit, spills the partial sums into hash partitions that are
+aggregated one at a time. Both work on the raw | separated lines, so only
+the key and value fields are converted.
+
+Usage:
+python -m tasks.external schedule <reservation file> [memory MB]
+python -m tasks.external top <reservation file> [count] [memory MB]
+python -m tasks.external bench [rows]
+
+The memory limit is an estimate of the buffered data (string sizes plus a
+fixed per-line overhead), not a hard limit on the process.
+"""
+
+import heapq
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Iterable, Iterator
+
+from tasks.schema import FIELD_TYPES, FORMATS
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Estimated bytes per buffered line besides the string itself (list slot, key tuple)
+LINE_OVERHEAD = 120
+# Estimated bytes per group in the aggregation dict
+GROUP_OVERHEAD = 250
+# Most runs merged at once; more runs are merged in several passes
+MAX_FAN_IN = 64
+
+_KEY_CONVERTERS = {int: int, float: float}
+
+
+def field_key(*names: str, format_name: str = "reservation") -> Callable[[str], tuple]:
+    """
+    Returns a key function that reads the given fields from a raw line.
+
+    Numbers are converted so that they sort by value; dates and times are
+    ISO strings and sort correctly as text.
+    """
+    positions = [FORMATS[format_name].index(name) for name in names]
+    converters = [_KEY_CONVERTERS.get(FIELD_TYPES[name], str.strip) for name in names]
+    pairs = list(zip(positions, converters))
+
+    def key(line: str) -> tuple:
+        fields = line.split("|")
+        return tuple([convert(fields[i]) for i, convert in pairs])
+    return key
+
+
+def _write_run(lines: list[str], directory: str, number: int) -> str:
+    """Writes sorted lines to a run file and returns its name."""
+    name = os.path.join(directory, f"run{number:05d}.txt")
+    with open(name, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    return name
+
+
+def _merge_runs(runs: list[str], key: Callable, reverse: bool, directory: str) -> list[str]:
+    """Merges groups of runs until at most MAX_FAN_IN remain."""
+    number = len(runs)
+    while len(runs) > MAX_FAN_IN:
+        merged = []
+        for i in range(0, len(runs), MAX_FAN_IN):
+            group = runs[i:i + MAX_FAN_IN]
+            files = [open(name, "r", encoding="utf-8") for name in group]
+            try:
+                name = os.path.join(directory, f"run{number:05d}.txt")
+                number += 1
+                with open(name, "w", encoding="utf-8") as out:
+                    out.writelines(heapq.merge(*files, key=key, reverse=reverse))
+            finally:
+                for f in files:
+                    f.close()
+            for old in group:
+                os.remove(old)
+            merged.append(name)
+        runs = merged
+    return runs
+
+
+def external_sort(lines: Iterable[str], key: Callable[[str], object], reverse: bool = False,
+                  memory_limit: int = DEFAULT_MEMORY_LIMIT, temp_dir: str | None = None,
+                  stats: dict | None = None) -> Iterator[str]:
+    """
+    Yields the non-empty lines sorted by key, spilling sorted runs to temporary files.
+
+    The sort is stable like sorted(). Every yielded line ends with a newline.
+    stats (when given) gets the number of runs and the spilled bytes.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(runs=0, spilled_bytes=0)
+
+    with tempfile.TemporaryDirectory(prefix="sort", dir=temp_dir) as directory:
+        runs = []
+        buffer: list[str] = []
+        used = 0
+        for line in lines:
+            if len(line) <= 1:
+                continue
+            if line[-1] != "\n":
+                line += "\n"
+            buffer.append(line)
+            used += sys.getsizeof(line) + LINE_OVERHEAD
+            if used >= memory_limit:
+                buffer.sort(key=key, reverse=reverse)
+                runs.append(_write_run(buffer, directory, len(runs)))
+                stats["spilled_bytes"] += os.path.getsize(runs[-1])
+                buffer = []
+                used = 0
+
+        buffer.sort(key=key, reverse=reverse)
+        if not runs:
+            yield from buffer
+            return
+        if buffer:
+            runs.append(_write_run(buffer, directory, len(runs)))
+            stats["spilled_bytes"] += os.path.getsize(runs[-1])
+            buffer = []
+        stats["runs"] = len(runs)
+
+        runs = _merge_runs(runs, key, reverse, directory)
+        files = [open(name, "r", encoding="utf-8") for name in runs]
+        try:
+            yield from heapq.merge(*files, key=key, reverse=reverse)
+        finally:
+            for f in files:
+                f.close()
+
+
+def external_group_by(lines: Iterable[str], key: Callable[[str], object], value: Callable[[str], object],
+                      memory_limit: int = DEFAULT_MEMORY_LIMIT, partitions: int = 16,
+                      temp_dir: str | None = None, stats: dict | None = None) -> Iterator[tuple]:
+    """
+    Yields (key, total) pairs, the values of each key added together.
+
+    The groups come out in no particular order. When the groups do not fit in
+    the memory limit, partial totals are spilled into hash partitions and each
+    partition is totalled separately, so one partition's groups must fit.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(spills=0, spilled_bytes=0)
+    max_groups = max(1, memory_limit // GROUP_OVERHEAD)
+
+    totals: dict = {}
+    partition_files = None
+    with tempfile.TemporaryDirectory(prefix="group", dir=temp_dir) as directory:
+        try:
+            for line in lines:
+                if len(line) <= 1:
+                    continue
+                k = key(line)
+                totals[k] = totals.get(k, 0) + value(line)
+                if len(totals) >= max_groups:
+                    if partition_files is None:
+                        partition_files = [open(os.path.join(directory, f"part{i:03d}.pickle"), "wb")
+                                           for i in range(partitions)]
+                    _spill(totals, partition_files)
+                    stats["spills"] += 1
+                    totals.clear()
+
+            if partition_files is None:
+                yield from totals.items()
+                return
+            _spill(totals, partition_files)
+            totals.clear()
+        finally:
+            if partition_files is not None:
+                for f in partition_files:
+                    f.close()
+
+        for f in partition_files:
+            stats["spilled_bytes"] += os.path.getsize(f.name)
+            with open(f.name, "rb") as partition:
+                while True:
+                    try:
+                        chunk = pickle.load(partition)
+                    except EOFError:
+                        break
+                    for k, total in chunk:
+                        totals[k] = totals.get(k, 0) + total
+            yield from totals.items()
+            totals.clear()
+
+
+def _spill(totals: dict, partition_files: list) -> None:
+    """Writes partial totals to the partition files by key hash."""
+    count = len(partition_files)
+    chunks: list[list] = [[] for _ in range(count)]
+    for item in totals.items():
+        chunks[hash(item[0]) % count].append(item)
+    for chunk, f in zip(chunks, partition_files):
+        if chunk:
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def revenue_cents(line: str) -> int:
+    """Revenue of a confirmed reservation line in cents, 0 when not confirmed."""
+    fields = line.split("|")
+    if fields[8].strip() != "True":
+        return 0
+    return round(float(fields[7]) * 100) * int(fields[6])
+
+
+def resource_schedule(lines: Iterable[str], memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                      stats: dict | None = None) -> Iterator[str]:
+    """Yields report lines of the reservations per resource sorted by date and time."""
+    key = field_key("reservedResource", "reservationDate", "reservationTime")
+    resource_name = None
+    for line in external_sort(lines, key, memory_limit=memory_limit, stats=stats):
+        fields = line.split("|")
+        if fields[9] != resource_name:
+            resource_name = fields[9]
+            yield f"{resource_name}:"
+        yield f"- {fields[4]} {fields[5]}, {fields[6]} h, {fields[1]}"
+
+
+def top_bookers(lines: Iterable[str], count: int = 10, memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                stats: dict | None = None) -> list[tuple[str, int]]:
+    """Returns the count emails with the most confirmed revenue as (email, cents), largest first."""
+    groups = external_group_by(lines, field_key("email"), revenue_cents, memory_limit, stats=stats)
+    return [(k[0], cents) for k, cents in heapq.nlargest(count, groups, key=lambda item: (item[1], item[0]))]
+
+
+def format_cents(cents: int) -> str:
+    """Formats cents as euros with a decimal comma."""
+    return f"{cents // 100},{cents % 100:02d} €"
+
+
+def write_synthetic_file(filename: str, rows: int, seed: int = 1) -> None:
+    """Writes a reservation file with random bookers, resources and dates."""
+    rng = random.Random(seed)
+    resources = [f"Room {i}" for i in range(200)]
+    bookers = max(1, rows // 4)
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            person = rng.randrange(bookers)
+            f.write(
+                f"{100_000 + i}|Booker {person}|booker{person}@example.fi|04{person % 10**8:08d}|"
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}|{rng.randint(8, 20):02d}:"
+                f"{rng.choice(('00', '15', '30', '45'))}|{rng.randint(1, 6)}|{rng.randint(500, 9999) / 100:.2f}|"
+                f"{rng.random() < 0.7}|{rng.choice(resources)}|2025-01-01 12:00:00\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is in KB on Linux)."""
+    import resource  # Unix only; imported here so the module loads on Windows
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def ordered_checksum(lines: Iterable[str]) -> int:
+    """CRC of the lines in order, computed without keeping them."""
+    crc = 0
+    for line in lines:
+        crc = zlib.crc32(line.encode(), crc)
+    return crc
+
+
+def unordered_checksum(items: Iterable[tuple]) -> int:
+    """Order-independent checksum of (key, total) pairs, computed without keeping them."""
+    return sum(map(hash, items)) % 2**64
+
+
+def run_measured(mode: str, filename: str, memory_limit: int) -> None:
+    """Runs one benchmark job and prints: seconds, peak RSS in MB, result check."""
+    start = time.perf_counter()
+    with open(filename, "r", encoding="utf-8") as f:
+        if mode == "sort":
+            key = field_key("reservedResource", "reservationDate", "reservationTime")
+            check = ordered_checksum(external_sort(f, key, memory_limit=memory_limit))
+        elif mode == "memory-sort":
+            key = field_key("reservedResource", "reservationDate", "reservationTime")
+            check = ordered_checksum(sorted(f, key=key))
+        elif mode == "group":
+            check = unordered_checksum(external_group_by(f, field_key("email"), revenue_cents, memory_limit))
+        else:
+            totals: dict = {}
+            email = field_key("email")
+            for line in f:
+                k = email(line)
+                totals[k] = totals.get(k, 0) + revenue_cents(line)
+            check = unordered_checksum(totals.items())
+    print(f"{time.perf_counter() - start:.3f} {peak_rss_mb():.1f} {check}")
+
+
+def benchmark(rows: int) -> None:
+    """Compares the external and in-memory sort and group-by in separate processes."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "reservations.txt")
+        write_synthetic_file(filename, rows)
+        size = os.path.getsize(filename)
+        # The data is 10 times the memory the external versions may use
+        limit = size // 10
+        print(f"Rows: {rows}, file {size / 2**20:.0f} MB, memory limit {limit / 2**20:.1f} MB")
+
+        # Same hash seed in all children so the result checks are comparable
+        env = dict(os.environ, PYTHONHASHSEED="0")
+        results = {}
+        for mode in ("sort", "memory-sort", "group", "memory-group"):
+            output = subprocess.run(
+                [sys.executable, "-m", "tasks.external", "measure", mode, filename, str(limit)],
+                capture_output=True, text=True, check=True, env=env).stdout.split()
+            seconds, rss, check = float(output[0]), float(output[1]), output[2]
+            results[mode] = check
+            print(f"{mode:13} {rows / seconds / 1000:6.0f} k rows/s, peak RSS {rss:6.1f} MB")
+        print(f"Same sort result: {results['sort'] == results['memory-sort']}, "
+              f"same groups: {results['group'] == results['memory-group']}")
+
+
+def main() -> None:
+    """Main function: prints a report or runs the benchmark."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ("schedule", "top", "bench", "measure"):
+        print(__doc__.strip())
+        return
+
+    if args[0] == "bench":
+        benchmark(int(args[1]) if len(args) > 1 else 1_000_000)
+    elif args[0] == "measure":
+        run_measured(args[1], args[2], int(args[3]))
+    elif args[0] == "schedule":
+        limit = int(float(args[2]) * 2**20) if len(args) > 2 else DEFAULT_MEMORY_LIMIT
+        with open(args[1], "r", encoding="utf-8") as f:
+            for line in resource_schedule(f, limit):
+                print(line)
+    else:
+        count = int(args[2]) if len(args) > 2 else 10
+        limit = int(float(args[3]) * 2**20) if len(args) > 3 else DEFAULT_MEMORY_LIMIT
+        with open(args[1], "r", encoding="utf-8") as f:
+            for email, cents in top_bookers(f, count, limit):
+                print(f"- {email}: {format_cents(cents)}")
+
+
+if __name__ == "__main__":
+    main()
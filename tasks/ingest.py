@@ -0,0 +1,162 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Validating ingest for reservation files.
+
+Every line is converted with the compiled schema converter and checked for
+field count, types, email and phone shape and date sanity. Bad lines are
+written to a quarantine file with their line numbers and the reason, and
+the good records keep streaming instead of the whole load being aborted.
+
+Usage: python -m tasks.ingest <reservation file> [quarantine file]
+
+The quarantine file has one tab separated line per bad row:
+line number, reason, original line.
+"""
+
+import math
+import re
+import sys
+from datetime import date, datetime
+from typing import Iterable, Iterator, TextIO
+
+from tasks.schema import FIELD_TYPES, FORMATS, get_converter, shape
+
+EMAIL = re.compile(r"[^@\s|]+@[^@\s|]+\.[A-Za-z]{2,}")
+PHONE = re.compile(r"\+?[0-9][0-9 -]{5,18}[0-9]")
+
+MIN_YEAR = 2000
+MAX_YEAR = 2100
+
+# Field positions used by check_record, per format
+_POSITIONS: dict[str, dict] = {}
+
+
+def _positions(format_name: str) -> dict:
+    """Returns the field positions the checks of a format need, computed once per format."""
+    if format_name not in _POSITIONS:
+        names = FORMATS[format_name]
+        _POSITIONS[format_name] = {
+            "width": len(names),
+            "bools": [i for i, name in enumerate(names) if FIELD_TYPES[name] is bool],
+            "dates": [i for i, name in enumerate(names) if FIELD_TYPES[name] in (date, datetime)],
+            **{name: names.index(name) if name in names else None for name in (
+                "email", "phone", "durationHours", "price",
+                "reservationDate", "reservationTime", "createdAt")},
+        }
+    return _POSITIONS[format_name]
+
+
+def check_record(fields: list[str], format_name: str = "reservation") -> tuple[str, list | None]:
+    """
+    Converts and checks one record.
+
+    Parameters:
+     fields (list[str]): Unconverted fields of one line
+     format_name (str): Key of schema.FORMATS
+
+    Returns:
+     problem (str): Why the record is invalid, "" when it is valid
+     values (list): Converted fields in format order, None when invalid
+    """
+    at = _positions(format_name)
+    if len(fields) != at["width"]:
+        return f"expected {at['width']} fields, got {len(fields)}", None
+
+    # The converter accepts only the strict shapes, so dates and times never have a UTC offset
+    try:
+        values = get_converter(format_name, "list")(fields)
+    except ValueError as e:
+        return f"invalid value: {e}", None
+
+    for i in at["bools"]:
+        if fields[i].strip() not in ("True", "False"):
+            return f"{FORMATS[format_name][i]} must be True or False", None
+    for i in at["dates"]:
+        if not MIN_YEAR <= values[i].year <= MAX_YEAR:
+            return f"{FORMATS[format_name][i]} year out of range {MIN_YEAR}-{MAX_YEAR}", None
+
+    if at["email"] is not None and not EMAIL.fullmatch(values[at["email"]].strip()):
+        return "invalid email", None
+    if at["phone"] is not None and not PHONE.fullmatch(values[at["phone"]].strip()):
+        return "invalid phone number", None
+    if values[at["durationHours"]] <= 0:
+        return "durationHours must be positive", None
+    if not math.isfinite(values[at["price"]]):
+        return "price must be a finite number", None
+    if values[at["price"]] < 0:
+        return "price must not be negative", None
+    if at["createdAt"] is not None:
+        reserved = datetime.combine(values[at["reservationDate"]], values[at["reservationTime"]])
+        if values[at["createdAt"]] > reserved:
+            return "createdAt is after the reservation", None
+    return "", values
+
+
+def ingest(lines: Iterable[str], format_name: str = "reservation", output="list",
+           quarantine: TextIO | None = None, stats: dict | None = None) -> Iterator:
+    """
+    Yields the converted records of the valid lines.
+
+    Bad lines are written to the quarantine stream (when given) and counted in
+    stats: {"lines": ..., "valid": ..., "quarantined": ...}. Empty lines are skipped.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(lines=0, valid=0, quarantined=0)
+    names = FORMATS[format_name]
+
+    for line_no, line in enumerate(lines, start=1):
+        if len(line) <= 1:
+            continue
+        stats["lines"] += 1
+
+        text = line.rstrip("\r\n")
+        problem, values = check_record(text.split("|"), format_name)
+        if problem:
+            stats["quarantined"] += 1
+            if quarantine is not None:
+                quarantine.write(f"{line_no}\t{problem}\t{text}\n")
+            continue
+
+        stats["valid"] += 1
+        yield values if output == "list" else shape(values, names, output)
+
+
+def fetch_valid_reservations(reservation_file: str, quarantine_file: str | None = None,
+                             output="list", format_name: str = "reservation") -> tuple[list, dict]:
+    """
+    Reads a reservation file like fetch_reservations, but quarantines bad lines.
+
+    Returns:
+     reservations (list): Converted valid reservations
+     stats (dict): Line counts, see ingest
+    """
+    stats: dict = {}
+    quarantine = open(quarantine_file, "w", encoding="utf-8") if quarantine_file else None
+    try:
+        with open(reservation_file, "r", encoding="utf-8") as f:
+            reservations = list(ingest(f, format_name, output, quarantine, stats))
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+    return reservations, stats
+
+
+def main() -> None:
+    """Main function: ingests a reservation file and reports the quarantined lines."""
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return
+
+    reservation_file = sys.argv[1]
+    quarantine_file = sys.argv[2] if len(sys.argv) > 2 else reservation_file + ".quarantine"
+    _, stats = fetch_valid_reservations(reservation_file, quarantine_file)
+    print(f"Lines: {stats['lines']}, valid: {stats['valid']}, quarantined: {stats['quarantined']}")
+    if stats["quarantined"]:
+        print(f"Quarantined lines written to {quarantine_file}")
+
+
+if __name__ == "__main__":
+    main()
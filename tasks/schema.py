@@ -0,0 +1,188 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Shared schema and converters for the | separated reservation records.
+
+The fields and their types are declared once (field names from TaskC's
+HEADERS). For each record format and output shape (list, dict or a class
+such as TaskG's Reservation) one converter function is generated and
+compiled the first time it is asked for, so no field specs are looked up
+per row:
+
+convert = get_converter("reservation", "dict")
+reservation = convert(line.split("|"))
+
+The compiled converters parse dates and times with fromisoformat, but only
+values of the exact shape the strict rules expect (2025-11-12, 09:00,
+2025-08-12 14:33:20). Any other value, and any row the fast path cannot
+parse, goes through the strict strptime rules the Task programs used
+before, so the same rows are accepted and bad rows raise the same errors.
+"""
+
+from datetime import date, datetime, time
+from typing import Callable
+
+HEADERS = [
+    "reservationId",
+    "name",
+    "email",
+    "phone",
+    "reservationDate",
+    "reservationTime",
+    "durationHours",
+    "price",
+    "confirmed",
+    "reservedResource",
+    "createdAt",
+]
+
+FIELD_TYPES = {
+    "reservationId": int,
+    "name": str,
+    "email": str,
+    "phone": str,
+    "reservationDate": date,
+    "reservationTime": time,
+    "durationHours": int,
+    "price": float,
+    "confirmed": bool,
+    "paid": bool,
+    "reservedResource": str,
+    "createdAt": datetime,
+}
+
+# Field order of each record format
+FORMATS = {
+    # TaskC and TaskG: 201|Moomin Valley|moomin@whitevalley.org|...|2025-08-12 14:33:20
+    "reservation": HEADERS,
+    # TaskA and TaskB: 123|Anna Virtanen|2025-10-31|10:00|2|19.95|True|Meeting Room A|...
+    "booking": [
+        "reservationId",
+        "name",
+        "reservationDate",
+        "reservationTime",
+        "durationHours",
+        "price",
+        "paid",
+        "reservedResource",
+        "phone",
+        "email",
+    ],
+}
+
+STRICT_FORMATS = {
+    date: "%Y-%m-%d",
+    time: "%H:%M",
+    datetime: "%Y-%m-%d %H:%M:%S",
+}
+
+# Source expression of each type in the generated converters
+_FAST_EXPRESSIONS = {
+    int: "int({v})",
+    float: "float({v})",
+    str: "{v}",
+    bool: "{v}.strip() == 'True'",
+    # fromisoformat only for the exact shapes of STRICT_FORMATS, which it reads the same way
+    date: "(_date({v}) if len({v}) == 10 and {v}[4] == {v}[7] == '-' else _reject())",
+    time: "(_time({v}) if len({v}) == 5 and {v}[2] == ':' else _reject())",
+    datetime: "(_datetime(_s) if len(_s := {v}) == 19 and _s[4] == _s[7] == '-' and _s[10] == ' '"
+              " and _s[13] == _s[16] == ':' else _reject())",
+}
+
+_CONVERTERS: dict[tuple[str, object], Callable] = {}
+
+
+def _reject():
+    """Sends a value of another shape to the strict rules."""
+    raise ValueError("not in the strict format")
+
+
+def convert_field(value: str, field_type: type):
+    """Converts one field with the strict rules (strptime for dates and times)."""
+    if field_type is bool:
+        return value.strip() == "True"
+    if field_type is str:
+        return value
+    if field_type in STRICT_FORMATS:
+        parsed = datetime.strptime(value, STRICT_FORMATS[field_type])
+        if field_type is date:
+            return parsed.date()
+        if field_type is time:
+            return parsed.time()
+        return parsed
+    return field_type(value)
+
+
+def convert_strict(fields: list[str], format_name: str) -> list:
+    """Converts a record field by field from the declared types (reference path)."""
+    names = FORMATS[format_name]
+    if len(fields) < len(names):
+        raise IndexError(f"{format_name} record has {len(fields)} fields, expected {len(names)}")
+    # Like the original converters, only the last field is stripped (of the line break)
+    last = len(names) - 1
+    return [convert_field(fields[i].strip() if i == last else fields[i], FIELD_TYPES[name])
+            for i, name in enumerate(names)]
+
+
+def shape(values: list, names: list[str], output) -> object:
+    """Returns converted values as a list, a dict or an instance of the output class."""
+    if output == "list":
+        return values
+    if output == "dict":
+        return dict(zip(names, values))
+    return output(*values)
+
+
+def compile_converter(format_name: str, output="list") -> Callable:
+    """
+    Generates and compiles the converter of a record format.
+
+    Parameters:
+     format_name (str): Key of FORMATS
+     output: "list", "dict" or a class taking the fields positionally
+
+    Returns:
+     convert (function): fields (list[str]) -> converted record
+    """
+    names = FORMATS[format_name]
+    expressions = []
+    for i, name in enumerate(names):
+        value = f"f[{i}].strip()" if i == len(names) - 1 else f"f[{i}]"
+        expressions.append(_FAST_EXPRESSIONS[FIELD_TYPES[name]].format(v=value))
+
+    if output == "list":
+        body = "[" + ", ".join(expressions) + "]"
+    elif output == "dict":
+        body = "{" + ", ".join(f"{name!r}: {e}" for name, e in zip(names, expressions)) + "}"
+    else:
+        body = "_output(" + ", ".join(expressions) + ")"
+
+    source = (
+        "def convert(f):\n"
+        "    try:\n"
+        f"        return {body}\n"
+        "    except ValueError:\n"
+        "        return _shape(_strict(f, _format), _names, _output)\n"
+    )
+    namespace = {
+        "_date": date.fromisoformat,
+        "_time": time.fromisoformat,
+        "_datetime": datetime.fromisoformat,
+        "_reject": _reject,
+        "_strict": convert_strict,
+        "_shape": shape,
+        "_format": format_name,
+        "_names": names,
+        "_output": output,
+    }
+    exec(compile(source, f"<{format_name} converter>", "exec"), namespace)
+    return namespace["convert"]
+
+
+def get_converter(format_name: str, output="list") -> Callable:
+    """Returns the compiled converter of a record format, compiling it on first use."""
+    key = (format_name, output)
+    if key not in _CONVERTERS:
+        _CONVERTERS[key] = compile_converter(format_name, output)
+    return _CONVERTERS[key]
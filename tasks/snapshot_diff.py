@@ -0,0 +1,286 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Change data capture between full reservation file snapshots.
+
+A new reservations.txt snapshot is compared with the previous one in one
+pass: the lines are hashed into a set, and the set differences give the
+lines that were added or removed. Only those are matched by reservationId
+and converted, so unchanged lines cost a hash each. The inserted, updated
+(e.g. a flipped confirmation) and deleted reservations come out as changes:
+
+("insert", id, record), ("update", id, record), ("delete", id, None)
+
+ReservationTotals keeps the TaskG report figures up to date from those
+changes, so a refresh costs the hashing plus work proportional to the churn.
+
+Usage: python -m tasks.snapshot_diff [rows] [changed %]
+
+Duplicate lines within a snapshot are dropped. When the same id appears
+twice with different content the later line in the file wins.
+"""
+
+import random
+import sys
+import time
+from typing import Callable, Iterable
+
+from tasks import TASK_DIRS, import_task
+from tasks.schema import FORMATS, get_converter
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def record_id(line: str) -> str:
+    """Returns the reservationId field of a line, raising ValueError when it has no | separator."""
+    end = line.find("|")
+    if end < 0:
+        raise ValueError(f"not a | separated record: {line!r}")
+    return line[:end]
+
+
+class SnapshotDiff:
+    """
+    Remembers the lines of the last snapshot and returns the changes of the
+    next one.
+
+    The snapshot is kept as a set of lines, so the lines that differ from the
+    previous snapshot are found with set differences in C. Only those lines
+    are split, looked up by reservationId and converted.
+    """
+
+    def __init__(self, format_name: str = "reservation", output="dict"):
+        self.convert: Callable = get_converter(format_name, output)
+        self.width = len(FORMATS[format_name])
+        self.lines: set[str] = set()
+        self.by_id: dict[str, str] = {}
+        self.stats: dict[str, int] = {}
+
+    def _resolve(self, lines: list[str], conflicts: set[str], winners: dict[str, str],
+                 current: set[str]) -> None:
+        """Keeps the last line of each id that occurs more than once with different content."""
+        for line in lines:
+            if line and record_id(line) in conflicts:
+                key = record_id(line)
+                current.discard(winners.get(key, ""))
+                winners[key] = line
+                current.add(line)
+        for key in conflicts:
+            if winners[key] == self.by_id.get(key):
+                del winners[key]
+
+    def _fields(self, line: str) -> list[str]:
+        """Splits a line, raising ValueError when it has too few fields for the format."""
+        fields = line.split("|")
+        if len(fields) < self.width:
+            raise ValueError(f"record has {len(fields)} fields, expected {self.width}: {line!r}")
+        return fields
+
+    def diff(self, lines: Iterable[str]) -> list[tuple]:
+        """
+        Returns the changes from the previous snapshot to the given lines
+        and remembers the lines as the new snapshot. The counts are in self.stats.
+
+        When a changed line cannot be converted or has too few fields, the
+        ValueError is raised and the previous snapshot is kept, so the same
+        diff can be run again.
+        """
+        lines = list(map(str.rstrip, lines))
+        current = set(lines)
+        current.discard("")
+        added = current - self.lines
+        removed = self.lines - current
+        by_id = self.by_id
+
+        winners: dict[str, str] = {}
+        conflicts: set[str] = set()
+        for line in added:
+            key = record_id(line)
+            if key in winners or by_id.get(key) in current:
+                conflicts.add(key)
+            winners[key] = line
+        if conflicts:
+            self._resolve(lines, conflicts, winners, current)
+
+        # Convert every changed line before touching the state, so a line
+        # that fails to convert leaves the previous snapshot as it was
+        convert = self.convert
+        upserts = [(UPDATE if key in by_id else INSERT, key, convert(self._fields(line)))
+                   for key, line in winners.items()]
+        changes = []
+        for line in removed:
+            key = record_id(line)
+            if by_id.get(key) == line and key not in winners:
+                changes.append((DELETE, key, None))
+
+        stats = {INSERT: 0, UPDATE: 0, DELETE: len(changes)}
+        for _, key, _ in changes:
+            del by_id[key]
+        for change in upserts:
+            stats[change[0]] += 1
+        by_id.update(winners)
+        changes.extend(upserts)
+
+        stats["unchanged"] = len(current) - len(winners)
+        stats["duplicates"] = len(lines) - lines.count("") - len(current)
+        self.lines = current
+        self.stats = stats
+        return changes
+
+    def diff_file(self, reservation_file: str) -> list[tuple]:
+        """Returns the changes from the previous snapshot to the given file."""
+        with open(reservation_file, "r", encoding="utf-8") as f:
+            return self.diff(f.read().splitlines())
+
+
+class ReservationTotals:
+    """
+    TaskG's report figures kept up to date from snapshot changes.
+
+    Each reservation's contribution is remembered by id, so an update or a
+    delete first takes the old contribution out. Revenue is kept in integer
+    cents so that adding and removing reservations never drifts.
+    """
+
+    def __init__(self):
+        # id -> (confirmed, revenue in cents, long)
+        self.contributions: dict[str, tuple[bool, int, bool]] = {}
+        self.confirmed = 0
+        self.revenue_cents = 0
+        self.long = 0
+
+    def _add(self, contribution: tuple[bool, int, bool], sign: int) -> None:
+        confirmed, cents, long = contribution
+        self.confirmed += sign * confirmed
+        self.long += sign * long
+        if confirmed:
+            self.revenue_cents += sign * cents
+
+    def apply(self, changes: Iterable[tuple]) -> int:
+        """Applies changes from SnapshotDiff.diff and returns how many were applied."""
+        contributions = self.contributions
+        count = 0
+        for kind, key, record in changes:
+            count += 1
+            old = contributions.pop(key, None)
+            if old is not None:
+                self._add(old, -1)
+            if kind == DELETE:
+                continue
+            # Only confirmed reservations have revenue, so the price of the others is never read
+            contribution = (
+                record["confirmed"],
+                round(record["price"] * 100) * record["durationHours"] if record["confirmed"] else 0,
+                record["durationHours"] >= 3,
+            )
+            contributions[key] = contribution
+            self._add(contribution, 1)
+        return count
+
+    @property
+    def total(self) -> int:
+        """Number of reservations."""
+        return len(self.contributions)
+
+    def summary(self) -> list[str]:
+        """Returns the confirmation summary and revenue lines of the TaskG report."""
+        euros, cents = divmod(self.revenue_cents, 100)
+        return [
+            f"- Confirmed reservations: {self.confirmed} pcs",
+            f"- Not confirmed reservations: {self.total - self.confirmed} pcs",
+            f"Total revenue from confirmed reservations: {euros},{cents:02d} €",
+        ]
+
+
+def full_summary(lines: Iterable[str]) -> list[str]:
+    """Reference: converts every line and recomputes the report figures like TaskG does."""
+    convert = get_converter("reservation", "dict")
+    latest = {}
+    for line in lines:
+        if len(line) > 1:
+            text = line.rstrip("\r\n")
+            latest[record_id(text)] = convert(text.split("|"))
+    reservations = list(latest.values())
+    confirmed = len([r for r in reservations if r["confirmed"]])
+    revenue = sum(r["durationHours"] * r["price"] for r in reservations if r["confirmed"])
+    return [
+        f"- Confirmed reservations: {confirmed} pcs",
+        f"- Not confirmed reservations: {len(reservations) - confirmed} pcs",
+        f"Total revenue from confirmed reservations: {revenue:.2f} €".replace(".", ","),
+    ]
+
+
+def synthetic_snapshot(count: int) -> list[str]:
+    """Builds a snapshot of count reservations from the TaskG example lines."""
+    with open(f"{TASK_DIRS['taskg']}/reservations.txt", "r", encoding="utf-8") as f:
+        examples = [line.rstrip("\n").split("|") for line in f if len(line) > 1]
+    lines = []
+    for i in range(count):
+        fields = list(examples[i % len(examples)])
+        fields[0] = str(100_000 + i)
+        lines.append("|".join(fields) + "\n")
+    return lines
+
+
+def churn(lines: list[str], percent: float, seed: int = 1) -> list[str]:
+    """Returns the next snapshot: confirmation flips, deletes and inserts on percent of the lines."""
+    rng = random.Random(seed)
+    changed = list(lines)
+    width = len(FORMATS["reservation"])
+    next_id = 100_000 + len(lines)
+    for i in rng.sample(range(len(lines)), int(len(lines) * percent / 100)):
+        fields = changed[i].rstrip("\n").split("|")
+        action = rng.random()
+        if action < 0.6:
+            fields[8] = "False" if fields[8] == "True" else "True"
+            changed[i] = "|".join(fields) + "\n"
+        elif action < 0.8:
+            changed[i] = ""
+        else:
+            fields[0] = str(next_id)
+            next_id += 1
+            changed.append("|".join(fields[:width]) + "\n")
+    return [line for line in changed if line]
+
+
+def main() -> None:
+    """Main function: compares a full reload with applying the changes of a snapshot."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    percent = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    best_time = import_task("taskf", "timestamps").best_time
+    first = synthetic_snapshot(count)
+    second = churn(first, percent)
+
+    def load() -> tuple[SnapshotDiff, ReservationTotals]:
+        engine = SnapshotDiff()
+        totals = ReservationTotals()
+        totals.apply(engine.diff(first))
+        return engine, totals
+
+    initial_time = best_time(load)
+
+    diff_time = float("inf")
+    for _ in range(3):
+        engine, totals = load()
+        start = time.perf_counter()
+        applied = totals.apply(engine.diff(second))
+        diff_time = min(diff_time, time.perf_counter() - start)
+    full_time = best_time(full_summary, second)
+
+    print(f"Rows: {count}, changed: {percent} %")
+    print(f"Initial load through the diff:  {initial_time * 1000:.1f} ms")
+    print(f"Full reload and recompute:      {full_time * 1000:.1f} ms")
+    print(f"Diff and apply {applied} changes: {diff_time * 1000:.1f} ms "
+          f"({full_time / diff_time:.1f}x faster)")
+    print(f"Changes: {engine.stats}")
+    print(f"Same report figures: {totals.summary() == full_summary(second)}")
+    for line in totals.summary():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
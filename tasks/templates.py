@@ -0,0 +1,203 @@
+# Copyright (c) 2026 Rina Poutiainen-Uekusa
+# License: MIT
+
+"""
+Report table layouts compiled into row renderers.
+
+A layout lists its columns once: the field each one reads, its kind
+(text, number, percent, date, time or weekday), width, alignment, decimals
+and the text between columns. From that, one function per output format is
+generated and compiled when the layout is created, like the converters in
+tasks.schema, so rendering a row is a single f-string with no format
+decisions left:
+
+WEEK = Layout([Column("day", "weekday", 12), Column("date", "date", 12), ...])
+lines = WEEK.render_text(rows)
+
+The same rows can be rendered as text lines, as CSV (; separated, decimal
+comma like the meter files) or as JSON. Dates and times are formatted from
+caches instead of strftime, as reports repeat the same few days.
+"""
+
+import csv
+import io
+from collections.abc import Callable, Iterable
+from datetime import date, time
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+KINDS = ["text", "number", "percent", "date", "time", "weekday"]
+
+
+class _DateText(dict):
+    """Formatted dates: date -> dd.mm.yyyy."""
+
+    def __missing__(self, key: date) -> str:
+        text = self[key] = f"{key.day:02d}.{key.month:02d}.{key.year}"
+        return text
+
+
+class _TimeText(dict):
+    """Formatted times: time -> HH.MM."""
+
+    def __missing__(self, key: time) -> str:
+        text = self[key] = f"{key.hour:02d}.{key.minute:02d}"
+        return text
+
+
+_DATES = _DateText()
+_TIMES = _TimeText()
+
+
+class Column:
+    """
+    One column of a layout.
+
+    Parameters:
+     name (str): Column name, the CSV header and JSON key
+     kind (str): One of KINDS
+     width (int): Text width, 0 = no padding
+     align (str): "<" or ">"; numbers are right aligned by default
+     decimals (int): Decimals of numbers and percentages
+     divisor (float): Numbers are divided by this first (e.g. 1000 for Wh -> kWh)
+     gap (str): Text before the column in text output; defaults to one
+                space, or nothing for the first column
+     suffix (str): Text after the value in text output (e.g. " kWh")
+     field: Index, key or attribute the value is read from; defaults to the
+            column's position (index access) or name (key and attribute access)
+     title (str): Header text in generated text headers, defaults to the name
+    """
+
+    def __init__(self, name: str, kind: str = "text", width: int = 0, align: str | None = None,
+                 decimals: int = 2, divisor: float = 1, gap: str | None = None, suffix: str = "",
+                 field: int | str | None = None, title: str | None = None):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown column kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.width = width
+        self.align = align or (">" if kind in ("number", "percent") else "<")
+        self.decimals = decimals
+        self.divisor = divisor
+        self.gap = gap
+        self.suffix = suffix
+        self.field = field
+        self.title = name if title is None else title
+
+
+def _literal(text: str) -> str:
+    """Escapes text for the literal part of a generated f-string."""
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("{", "{{").replace("}", "}}")
+
+
+class Layout:
+    """
+    A table layout with compiled text, CSV and JSON row renderers.
+
+    Parameters:
+     columns (list[Column]): Columns in output order
+     header (list[str] | None): Header lines of the text output; None
+                                generates one line from the column titles
+     access (str): How rows are read: "index" (lists, tuples), "key" (dicts)
+                   or "attribute" (objects)
+     decimal_comma (bool): Decimal comma in text and CSV output
+    """
+
+    def __init__(self, columns: list[Column], header: list[str] | None = None,
+                 access: str = "index", decimal_comma: bool = True):
+        if access not in ("index", "key", "attribute"):
+            raise ValueError(f"Unknown access: {access}")
+        self.columns = columns
+        self.access = access
+        self.decimal_comma = decimal_comma
+        self.gaps = [("" if i == 0 else " ") if column.gap is None else column.gap
+                     for i, column in enumerate(columns)]
+        self.header = header if header is not None else [self._generated_header()]
+        self.text_row: Callable = self._compile("text")
+        self.csv_row: Callable = self._compile("csv")
+        self.json_row: Callable = self._compile("json")
+
+    def _generated_header(self) -> str:
+        parts = []
+        for gap, column in zip(self.gaps, self.columns):
+            parts.append(gap + format(column.title, f"{column.align}{column.width}") + " " * len(column.suffix))
+        return "".join(parts).rstrip()
+
+    def _value(self, position: int, column: Column) -> str:
+        """Source expression reading the column's value from row r."""
+        if self.access == "index":
+            return f"r[{position if column.field is None else column.field!r}]"
+        field = column.name if column.field is None else column.field
+        return f"r[{field!r}]" if self.access == "key" else f"r.{field}"
+
+    def _expression(self, value: str, column: Column, output: str) -> str:
+        """Source expression of the formatted value."""
+        kind = column.kind
+        if kind in ("number", "percent"):
+            if column.divisor != 1:
+                value = f"{value} / {float(column.divisor)!r}"
+            if kind == "percent":
+                value = f"{value} * 100.0"
+            if output == "json":
+                return f"round({value}, {column.decimals})"
+            text = f"format({value}, '.{column.decimals}f')"
+            if self.decimal_comma:
+                text += ".replace('.', ',')"
+            return text + (" + ' %'" if kind == "percent" and output == "text" else "")
+        if kind == "date":
+            return f"{value}.isoformat()" if output == "json" else f"_dates[{value}]"
+        if kind == "time":
+            return f"{value}.isoformat('minutes')" if output == "json" else f"_times[{value}]"
+        if kind == "weekday":
+            return f"_weekdays[{value}.weekday()]"
+        return value
+
+    def _compile(self, output: str) -> Callable:
+        """Generates and compiles the row renderer of one output format."""
+        expressions = [self._expression(self._value(i, column), column, output)
+                       for i, column in enumerate(self.columns)]
+        if output == "text":
+            parts = []
+            for gap, column, expression in zip(self.gaps, self.columns, expressions):
+                spec = f":{column.align}{column.width}" if column.width else ""
+                parts.append(f"{_literal(gap)}{{{expression}{spec}}}{_literal(column.suffix)}")
+            body = 'f"' + "".join(parts) + '"'
+        elif output == "csv":
+            body = "[" + ", ".join(f"str({e})" for e in expressions) + "]"
+        else:
+            body = "{" + ", ".join(f"{c.name!r}: {e}" for c, e in zip(self.columns, expressions)) + "}"
+
+        source = f"def render(r):\n    return {body}\n"
+        namespace = {"_dates": _DATES, "_times": _TIMES, "_weekdays": WEEKDAYS}
+        exec(compile(source, f"<{output} row renderer>", "exec"), namespace)
+        return namespace["render"]
+
+    def render_text(self, rows: Iterable, header: bool = True) -> list[str]:
+        """Renders the rows as text lines, after the header lines."""
+        lines = list(self.header) if header else []
+        lines.extend(map(self.text_row, rows))
+        return lines
+
+    def render_csv(self, rows: Iterable) -> str:
+        """Renders the rows as ; separated CSV with a header row."""
+        out = io.StringIO()
+        writer = csv.writer(out, delimiter=";", lineterminator="\n")
+        writer.writerow([column.name for column in self.columns])
+        writer.writerows(map(self.csv_row, rows))
+        return out.getvalue()
+
+    def render_json(self, rows: Iterable) -> str:
+        """Renders the rows as a JSON list of objects."""
+        import json  # only JSON output needs it, the text reports never load it
+
+        return json.dumps(list(map(self.json_row, rows)), ensure_ascii=False)
+
+    def render(self, rows: Iterable, output: str = "text") -> str:
+        """Renders the rows in the given format ("text", "csv" or "json") as one string."""
+        if output == "text":
+            return "\n".join(self.render_text(rows))
+        if output == "csv":
+            return self.render_csv(rows)
+        if output == "json":
+            return self.render_json(rows)
+        raise ValueError(f"Unknown output format: {output}")